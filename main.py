@@ -1,11 +1,16 @@
 """Main execution entry point for OpenClawAgents content pipeline."""
 
 import asyncio
-import json
+import atexit
 import logging
+import logging.handlers
 import os
+import queue
 import sys
 from pathlib import Path
+from typing import Any, Dict, Tuple
+
+import orjson
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
@@ -13,15 +18,68 @@ sys.path.insert(0, str(Path(__file__).parent))
 from src.config.settings import EnvironmentConfig
 from src.workflow.workflow_engine import WorkflowEngine
 
-# Setup logging
-logging.basicConfig(
-    level=getattr(logging, EnvironmentConfig.LOG_LEVEL),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(),
-        logging.FileHandler("openclaw_agents.log"),
-    ],
-)
+try:
+    import uvloop
+except ImportError:  # Optional: falls back to the default asyncio loop
+    uvloop = None
+
+
+# Key metrics shown per completed task: (result key, default, line format)
+TASK_METRICS: Dict[str, Tuple[Tuple[str, Any, str], ...]] = {
+    "research": (("sources_found", 0, "  - Sources found: {}"),),
+    "writing": (("word_count", 0, "  - Word count: {}"),),
+    "seo": (("seo_score", 0, "  - SEO Score: {}/100"),),
+    "quality": (
+        ("quality_score", 0, "  - Quality Score: {}/100"),
+        ("approved", False, "  - Approved: {}"),
+    ),
+}
+
+
+def setup_logging() -> logging.handlers.QueueListener:
+    """Configure logging so handlers run on a background listener thread.
+
+    Records are put on an in-memory queue by the root logger; the listener
+    owns the console and rotating file handlers, keeping their writes off
+    the event loop.
+
+    Returns:
+        Started queue listener.
+    """
+    formatter = logging.Formatter(
+        "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    stream_handler = logging.StreamHandler()
+    file_handler = logging.handlers.RotatingFileHandler(
+        "openclaw_agents.log",
+        maxBytes=10 * 1024 * 1024,
+        backupCount=3,
+        encoding="utf-8",
+        delay=True,
+    )
+    for handler in (stream_handler, file_handler):
+        handler.setFormatter(formatter)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # Only merge args (and any traceback) here; the listener's handlers
+    # apply the real format.
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(
+        level=getattr(logging, EnvironmentConfig.LOG_LEVEL),
+        handlers=[queue_handler],
+    )
+    listener = logging.handlers.QueueListener(
+        log_queue, stream_handler, file_handler, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+# Load .env settings, then setup logging
+EnvironmentConfig.load()
+log_listener = setup_logging()
 
 logger = logging.getLogger(__name__)
 
@@ -54,67 +112,78 @@ async def main():
         # Execute pipeline
         pipeline_results = await engine.run_content_pipeline(topic)
 
-        # Display results
-        logger.info("\n" + "=" * 60)
-        logger.info("PIPELINE EXECUTION COMPLETE")
-        logger.info("=" * 60)
-
+        # Display results, as one record so the summary stays together
         pipeline = pipeline_results["pipeline"]
         results = pipeline_results["results"]
 
-        logger.info(f"\nPipeline ID: {pipeline['pipeline_id']}")
-        logger.info(f"Topic: {pipeline['topic']}")
-        logger.info(f"Iterations: {pipeline_results['iterations']}")
-
-        logger.info("\nTask Results:")
-        logger.info("-" * 60)
+        lines = [
+            "\n" + "=" * 60,
+            "PIPELINE EXECUTION COMPLETE",
+            "=" * 60,
+            f"\nPipeline ID: {pipeline['pipeline_id']}",
+            f"Topic: {pipeline['topic']}",
+            f"Iterations: {pipeline_results['iterations']}",
+            "\nTask Results:",
+            "-" * 60,
+        ]
 
         for task_name, task_id in pipeline["tasks"].items():
             task_result = results.get(task_id, {})
             status = task_result.get("status", "unknown")
-            logger.info(f"{task_name.upper()}: {status}")
+            lines.append(f"{task_name.upper()}: {status}")
 
             if status == "completed":
                 # Show key metrics
-                if task_name == "research":
-                    sources = task_result.get("sources_found", 0)
-                    logger.info(f"  - Sources found: {sources}")
-                elif task_name == "writing":
-                    word_count = task_result.get("word_count", 0)
-                    logger.info(f"  - Word count: {word_count}")
-                elif task_name == "seo":
-                    seo_score = task_result.get("seo_score", 0)
-                    logger.info(f"  - SEO Score: {seo_score}/100")
-                elif task_name == "quality":
-                    quality_score = task_result.get("quality_score", 0)
-                    approved = task_result.get("approved", False)
-                    logger.info(f"  - Quality Score: {quality_score}/100")
-                    logger.info(f"  - Approved: {approved}")
+                lines.extend(
+                    line.format(task_result.get(key, default))
+                    for key, default, line in TASK_METRICS.get(task_name, ())
+                )
+
+        logger.info("\n".join(lines))
 
         # Save final report
         report_file = Path(EnvironmentConfig.WORKSPACE_DIR) / "pipeline_report.json"
-        with open(report_file, "w", encoding="utf-8") as f:
-            json.dump(pipeline_results, f, indent=2, default=str)
+        # Serialize in one pass and write off the event loop
+        report = orjson.dumps(
+            pipeline_results,
+            option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+        await asyncio.to_thread(report_file.write_bytes, report)
 
         logger.info(f"\nFull report saved to: {report_file}")
 
-        # Display content preview if available
+        cache_stats = engine.llm_cache_stats()
+        logger.info(
+            f"LLM cache: {cache_stats.hits} hits, {cache_stats.misses} misses "
+            f"({cache_stats.hit_rate:.0%} hit rate), "
+            f"{cache_stats.tokens_saved} tokens saved"
+        )
+
+        # Display content preview if available; skipped entirely when INFO
+        # records would be dropped anyway
         writing_task_id = pipeline["tasks"].get("writing")
-        if writing_task_id and writing_task_id in results:
+        if (
+            writing_task_id in results
+            and logger.isEnabledFor(logging.INFO)
+        ):
             content = results[writing_task_id].get("content", "")
             if content:
-                logger.info("\n" + "=" * 60)
-                logger.info("CONTENT PREVIEW")
-                logger.info("=" * 60)
-                preview = content[:500] + "..." if len(content) > 500 else content
-                logger.info(preview)
+                ellipsis = "..." if len(content) > 500 else ""
+                banner = "=" * 60
+                logger.info(
+                    f"\n{banner}\nCONTENT PREVIEW\n{banner}\n{content[:500]}{ellipsis}"
+                )
 
     except Exception as e:
-        logger.error(f"Pipeline execution failed: {str(e)}", exc_info=True)
+        # The traceback is logged once by the top-level handler
+        logger.error(f"Pipeline execution failed: {str(e)}")
         raise
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
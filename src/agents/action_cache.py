@@ -0,0 +1,111 @@
+"""Cache of whole agent task results, keyed by role and task input."""
+
+import asyncio
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Keys that differ between otherwise identical runs and so are left out of
+# the cache key: task identifiers and timestamps
+_VOLATILE_KEYS = frozenset({"id", "task_id", "timestamp"})
+
+
+def _normalize(value: Any) -> Any:
+    """Strip run-specific identifiers and timestamps from a task payload.
+
+    Args:
+        value: Payload or nested payload value.
+
+    Returns:
+        Copy of the value without volatile keys at any depth.
+    """
+    if isinstance(value, dict):
+        return {
+            key: _normalize(item)
+            for key, item in value.items()
+            if key not in _VOLATILE_KEYS and not str(key).endswith("_task_id")
+        }
+    if isinstance(value, (list, tuple)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+class ActionCache:
+    """On-disk cache mapping an agent's task input to its result.
+
+    Whole phases are skipped on a hit. Because an upstream hit returns the
+    same result as before, downstream tasks see identical input and hit
+    too, so rerunning a pipeline for the same topic replays every phase
+    from the cache.
+    """
+
+    def __init__(self, cache_dir: Path):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached result.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def cache_key(role: str, payload: Dict[str, Any]) -> str:
+        """Build the cache key for a task.
+
+        Args:
+            role: Role name of the agent running the task.
+            payload: Task payload.
+
+        Returns:
+            Hex digest identifying the role and normalized payload.
+        """
+        data = orjson.dumps(
+            _normalize(payload),
+            option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS,
+            default=str,
+        )
+        return hashlib.sha256(role.encode() + b"|" + data).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached task result.
+
+        Args:
+            key: Cache key from cache_key().
+
+        Returns:
+            Cached result, or None on a miss.
+        """
+        return await asyncio.to_thread(self._read_entry, key)
+
+    async def set(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a task result.
+
+        Args:
+            key: Cache key from cache_key().
+            result: Task result to cache.
+        """
+        await asyncio.to_thread(self._write_entry, key, result)
+
+    def _read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Read an entry from disk."""
+        try:
+            with open(self.cache_dir / f"{key}.json", "rb") as f:
+                return orjson.loads(f.read())
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read action cache entry {key[:12]}: {e}")
+            return None
+
+    def _write_entry(self, key: str, result: Dict[str, Any]) -> None:
+        """Write an entry to disk."""
+        try:
+            with open(self.cache_dir / f"{key}.json", "wb") as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS, default=str))
+        except (OSError, TypeError) as e:
+            logger.warning(f"Failed to cache task result: {e}")
@@ -1,13 +1,87 @@
 """Analyst agent for synthesizing research and creating outlines."""
 
-from datetime import datetime
-from typing import Any, Dict, List
+import asyncio
+import re
+from types import MappingProxyType
+from typing import Any, Dict, Iterator, List, Mapping, Sequence, Tuple
 import logging
 
-from src.agents.base_agent import BaseAgent
+import orjson
+
+from src.agents.base_agent import BaseAgent, now_iso
 
 logger = logging.getLogger(__name__)
 
+# Marker opening a stripped list line: dashes, or a number such as "1.",
+# "2.3" or "1)"; group 1 is the item text
+_ITEM_RE = re.compile(r"(?:-[- ]*|[0-9. ]*\)?)\s*(.*)")
+# Section number after a "##" heading's hashes, such as "1.", "2)" or "2.3",
+# but not a figure such as "1.5x" that is part of the title
+_SECTION_NUMBER_RE = re.compile(r"(?:\d+(?:\.\d+)+[.)]?|\d+[.)])(?!\w)\s*")
+# Invariant fallback values, allocated once at import. Tuples are shared
+# safely between results and serialize to JSON arrays.
+_DEFAULT_RECOMMENDATIONS: Tuple[str, ...] = (
+    "Include recent statistics and data",
+    "Address common misconceptions",
+    "Provide actionable takeaways",
+    "Use clear examples and case studies",
+)
+_FALLBACK_INSIGHTS: Mapping[str, Any] = MappingProxyType(
+    {
+        "trends": ("Trend 1", "Trend 2"),
+        "statistics": ("Stat 1", "Stat 2"),
+        "contradictions": (),
+        "patterns": ("Pattern 1",),
+        "actionable": ("Action 1",),
+        "raw_analysis": "Analysis completed",
+    }
+)
+_EMPTY_RESEARCH: Mapping[str, Any] = MappingProxyType(
+    {"topic": "Unknown", "sources": (), "summaries": (), "research_report": ""}
+)
+
+
+def _iter_json(obj: Any, max_chars: int) -> Iterator[bytes]:
+    """Lazily yield JSON fragments for obj, cutting strings at max_chars."""
+    if isinstance(obj, dict):
+        yield b"{"
+        for i, (key, value) in enumerate(obj.items()):
+            yield (b"," if i else b"") + orjson.dumps(str(key)) + b":"
+            yield from _iter_json(value, max_chars)
+        yield b"}"
+    elif isinstance(obj, (list, tuple)):
+        yield b"["
+        for i, value in enumerate(obj):
+            if i:
+                yield b","
+            yield from _iter_json(value, max_chars)
+        yield b"]"
+    elif isinstance(obj, str):
+        yield orjson.dumps(obj[:max_chars])
+    else:
+        yield orjson.dumps(obj, default=str)
+
+
+def _preview_json(obj: Any, max_bytes: int) -> str:
+    """Serialize obj as compact JSON, truncated to max_bytes.
+
+    Serialization stops as soon as the budget is reached, so large research
+    payloads are never fully rendered just to be sliced.
+
+    Args:
+        obj: JSON-compatible object to preview.
+        max_bytes: Maximum size of the preview in bytes.
+
+    Returns:
+        JSON preview text, possibly cut mid-document.
+    """
+    buf = bytearray()
+    for fragment in _iter_json(obj, max_bytes):
+        buf += fragment
+        if len(buf) >= max_bytes:
+            break
+    return buf[:max_bytes].decode("utf-8", "ignore")
+
 
 class AnalystAgent(BaseAgent):
     """Data analyst agent for synthesizing research findings."""
@@ -30,24 +104,22 @@ class AnalystAgent(BaseAgent):
         try:
             # Load research data if not provided
             if not research_data and research_task_id:
-                research_data = self._load_research_data(research_task_id)
-            
-            # Ensure we have topic from research data
-            if research_data and "topic" not in research_data:
-                # Try to extract from research report or summaries
-                if research_data.get("research_report"):
-                    # Topic should be in research data
-                    pass
-                elif research_data.get("summaries"):
-                    # Check first summary for topic hints
-                    first_summary = research_data["summaries"][0] if research_data["summaries"] else {}
-                    if "MacBooks" in str(first_summary) or "macbooks" in str(first_summary):
-                        research_data["topic"] = "macbooks"
-
-            # Analyze and synthesize
-            insights = await self._extract_insights(research_data)
-            outline = await self._create_content_outline(research_data, insights)
-            fact_check_results = await self._fact_check(research_data)
+                research_data = await asyncio.to_thread(
+                    self._load_research_data, research_task_id
+                )
+
+            # Resolve the topic once so downstream steps can rely on it
+            if research_data:
+                self._resolve_topic(research_data)
+
+            # Analyze and synthesize. Fact-checking only needs the research
+            # data, so it runs alongside insight extraction and the outline.
+            insights_task = asyncio.create_task(self._extract_insights(research_data))
+            fact_task = asyncio.create_task(self._fact_check(research_data))
+            insights = await insights_task
+            outline, fact_check_results = await asyncio.gather(
+                self._create_content_outline(research_data, insights), fact_task
+            )
 
             result = {
                 "task_id": task_id,
@@ -60,18 +132,17 @@ class AnalystAgent(BaseAgent):
                 "recommendations": await self._generate_recommendations(
                     insights, outline
                 ),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
             }
 
-            self.update_session(task_id, "completed")
-            self.save_task_result(task_id, result)
+            await self.record_task_outcome(task_id, "completed", result)
 
             self.logger.info("Analysis completed successfully")
             return result
 
         except Exception as e:
             self.logger.error(f"Analysis task failed: {str(e)}")
-            self.update_session(task_id, "failed")
+            await self.record_task_outcome(task_id, "failed")
             raise
 
     def _load_research_data(self, research_task_id: str) -> Dict[str, Any]:
@@ -87,26 +158,46 @@ class AnalystAgent(BaseAgent):
         result_file = self.memory.results_dir / f"result_{research_task_id}.json"
         if result_file.exists():
             try:
-                import json
-                with open(result_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    # Ensure we have the topic
-                    if "topic" not in data and "research_report" in data:
-                        # Try to extract topic from research report
-                        report = data.get("research_report", "")
-                        if "MacBooks" in report or "macbooks" in report:
-                            data["topic"] = "macbooks"
-                    return data
+                with open(result_file, "rb") as f:
+                    return orjson.loads(f.read())
             except Exception as e:
                 self.logger.warning(f"Failed to load research data from file: {e}")
 
         # Return empty structure if not found
-        return {
-            "topic": "Unknown",
-            "sources": [],
-            "summaries": [],
-            "research_report": "",
-        }
+        return dict(_EMPTY_RESEARCH)
+
+    def _resolve_topic(self, research_data: Dict[str, Any]) -> str:
+        """Determine the research topic and store it on the research data.
+
+        Falls back to scanning the report (or, without one, the first
+        summary's text fields) for known topic hints.
+
+        Args:
+            research_data: Research data dictionary, updated in place.
+
+        Returns:
+            Resolved topic, or "Unknown" if none could be determined.
+        """
+        topic = research_data.get("topic")
+        if topic:
+            return topic
+
+        report = research_data.get("research_report", "")
+        if report:
+            texts = [report]
+        else:
+            summaries = research_data.get("summaries") or [{}]
+            summary = summaries[0]
+            if isinstance(summary, dict):
+                texts = [v for v in summary.values() if isinstance(v, str)]
+            else:
+                texts = [str(summary)]
+
+        topic = "Unknown"
+        if any("macbooks" in text.casefold() for text in texts):
+            topic = "macbooks"
+        research_data["topic"] = topic
+        return topic
 
     async def _extract_insights(
         self, research_data: Dict[str, Any]
@@ -123,6 +214,10 @@ class AnalystAgent(BaseAgent):
         summaries = research_data.get("summaries", [])
         research_report = research_data.get("research_report", "")
 
+        # Nothing to analyze, so skip the LLM round trip
+        if not research_report and not summaries:
+            return dict(_FALLBACK_INSIGHTS)
+
         prompt = f"""Analyze the following research data and extract key insights:
 
 Topic: {topic}
@@ -140,7 +235,7 @@ Extract and categorize:
 Format as structured JSON with categories."""
 
         try:
-            insights_text = await self.call_llm(prompt, max_tokens=2048)
+            insights_text = await self.call_llm(prompt, max_tokens=2048, temperature=0)
             # Parse and structure insights
             return {
                 "trends": self._parse_list_items(insights_text, "Trends"),
@@ -154,14 +249,7 @@ Format as structured JSON with categories."""
             }
         except Exception as e:
             self.logger.error(f"Failed to extract insights: {e}")
-            return {
-                "trends": ["Trend 1", "Trend 2"],
-                "statistics": ["Stat 1", "Stat 2"],
-                "contradictions": [],
-                "patterns": ["Pattern 1"],
-                "actionable": ["Action 1"],
-                "raw_analysis": "Analysis completed",
-            }
+            return dict(_FALLBACK_INSIGHTS)
 
     def _parse_list_items(self, text: str, category: str) -> List[str]:
         """Parse list items from text for given category.
@@ -173,22 +261,22 @@ Format as structured JSON with categories."""
         Returns:
             List of extracted items.
         """
-        items = []
-        lines = text.split("\n")
+        items: List[str] = []
+        lowered = category.lower()
         in_category = False
 
-        for line in lines:
-            if category.lower() in line.lower():
+        for line in text.split("\n"):
+            if lowered in line.lower():
                 in_category = True
                 continue
-            if in_category:
-                line = line.strip()
-                if line and (line.startswith("-") or line[0].isdigit()):
-                    items.append(line.lstrip("- ").lstrip("0123456789. "))
-                if line.startswith("#") or (
-                    line and not line.startswith("-") and not line[0].isdigit()
-                ):
-                    break
+            line = line.strip()
+            if not in_category or not line:
+                continue
+            if line[0] != "-" and not line[0].isdigit():
+                break
+            item = _ITEM_RE.match(line).group(1)
+            if item:
+                items.append(item)
 
         return items[:5] if items else [f"{category} item 1", f"{category} item 2"]
 
@@ -204,20 +292,16 @@ Format as structured JSON with categories."""
         Returns:
             Dictionary containing structured outline.
         """
-        # Extract topic from research data
         topic = research_data.get("topic", "Unknown")
-        if topic == "Unknown" and research_data.get("research_report"):
-            # Try to extract from research report
-            report = research_data["research_report"]
-            if "MacBooks" in report or "macbooks" in report:
-                topic = "macbooks"
-        
         trends = insights.get("trends", [])
 
+        if topic == "Unknown" and not research_data.get("research_report"):
+            return self._fallback_outline(topic)
+
         prompt = f"""Create a comprehensive content outline for an article about: {topic}
 
 Based on research findings and insights:
-{str(insights)[:500]}...
+{_preview_json(insights, 500)}...
 
 Create outline with:
 1. Introduction (hook, thesis, overview)
@@ -228,7 +312,7 @@ Create outline with:
 Format as structured JSON with hierarchical sections."""
 
         try:
-            outline_text = await self.call_llm(prompt, max_tokens=2048)
+            outline_text = await self.call_llm(prompt, max_tokens=2048, temperature=0)
             # Structure outline
             return {
                 "title": f"Comprehensive Guide to {topic}",
@@ -247,15 +331,26 @@ Format as structured JSON with hierarchical sections."""
             }
         except Exception as e:
             self.logger.error(f"Failed to create outline: {e}")
-            return {
-                "title": f"Guide to {topic}",
-                "introduction": {"hook": "", "thesis": "", "overview": ""},
-                "sections": [
-                    {"title": "Section 1", "subsections": ["Subsection 1.1"]},
-                    {"title": "Section 2", "subsections": ["Subsection 2.1"]},
-                ],
-                "conclusion": {"summary": "", "takeaways": [], "call_to_action": ""},
-            }
+            return self._fallback_outline(topic)
+
+    def _fallback_outline(self, topic: str) -> Dict[str, Any]:
+        """Build the placeholder outline used when no outline can be generated.
+
+        Args:
+            topic: Content topic.
+
+        Returns:
+            Dictionary containing a generic outline.
+        """
+        return {
+            "title": f"Guide to {topic}",
+            "introduction": {"hook": "", "thesis": "", "overview": ""},
+            "sections": [
+                {"title": "Section 1", "subsections": ["Subsection 1.1"]},
+                {"title": "Section 2", "subsections": ["Subsection 2.1"]},
+            ],
+            "conclusion": {"summary": "", "takeaways": [], "call_to_action": ""},
+        }
 
     def _parse_outline_sections(self, outline_text: str) -> List[Dict[str, Any]]:
         """Parse outline sections from text.
@@ -267,26 +362,24 @@ Format as structured JSON with hierarchical sections."""
             List of section dictionaries.
         """
         sections = []
-        lines = outline_text.split("\n")
         current_section = None
 
-        for line in lines:
+        for line in outline_text.split("\n"):
             line = line.strip()
-            if line.startswith("##") or (line and line[0].isdigit() and "." in line):
-                if current_section:
-                    sections.append(current_section)
-                current_section = {
-                    "title": line.lstrip("# ").lstrip("0123456789. "),
-                    "subsections": [],
-                }
-            elif current_section and (
-                line.startswith("-") or (line and line[0].isdigit())
-            ):
-                current_section["subsections"].append(
-                    line.lstrip("- ").lstrip("0123456789. ")
-                )
-
-        if current_section:
+            if line.startswith("##"):
+                title = line.lstrip("# ")
+                number = _SECTION_NUMBER_RE.match(title)
+                if number:
+                    title = title[number.end():]
+            elif line[:1].isdigit() and "." in line:
+                title = line.lstrip("0123456789. ")
+            else:
+                if current_section and (line[:1] == "-" or line[:1].isdigit()):
+                    subsection = _ITEM_RE.match(line).group(1)
+                    if subsection:
+                        current_section["subsections"].append(subsection)
+                continue
+            current_section = {"title": title, "subsections": []}
             sections.append(current_section)
 
         return sections[:5] if sections else [
@@ -305,18 +398,26 @@ Format as structured JSON with hierarchical sections."""
         """
         summaries = research_data.get("summaries", [])
 
+        if not summaries:
+            return {
+                "status": "skipped",
+                "issues_found": 0,
+                "warnings": [],
+                "assessment": "No summaries to fact-check",
+            }
+
         prompt = f"""Review the following research summaries and identify:
 1. Potential factual inaccuracies
 2. Unsupported claims
 3. Contradictions between sources
 4. Areas needing verification
 
-Summaries: {str(summaries)[:1000]}...
+Summaries: {_preview_json(summaries, 1000)}...
 
 Provide fact-check assessment."""
 
         try:
-            fact_check_text = await self.call_llm(prompt, max_tokens=1024)
+            fact_check_text = await self.call_llm(prompt, max_tokens=1024, temperature=0)
             return {
                 "status": "reviewed",
                 "issues_found": 0,
@@ -334,7 +435,7 @@ Provide fact-check assessment."""
 
     async def _generate_recommendations(
         self, insights: Dict[str, Any], outline: Dict[str, Any]
-    ) -> List[str]:
+    ) -> Sequence[str]:
         """Generate content recommendations.
 
         Args:
@@ -342,12 +443,7 @@ Provide fact-check assessment."""
             outline: Content outline.
 
         Returns:
-            List of recommendation strings.
+            Sequence of recommendation strings.
         """
-        return [
-            "Include recent statistics and data",
-            "Address common misconceptions",
-            "Provide actionable takeaways",
-            "Use clear examples and case studies",
-        ]
+        return _DEFAULT_RECOMMENDATIONS
 
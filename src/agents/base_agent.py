@@ -1,15 +1,55 @@
 """Base agent class with memory and tool management."""
 
-import json
+import asyncio
 import os
+import threading
+import time
+import weakref
 from abc import ABC, abstractmethod
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 import logging
 
+import httpx
+import orjson
+from groq import AsyncGroq
+
+from src.agents.action_cache import ActionCache
+from src.agents.llm_cache import LLMCache
+from src.agents.rate_limiter import RateLimiter
+from src.config.settings import EnvironmentConfig
+
 logger = logging.getLogger(__name__)
 
+# Pretty-printed output that, like the stdlib encoder, accepts non-str keys.
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# (epoch second, formatted timestamp) of the last now_iso() call
+_now_iso_cache = (0, "")
+
+# Most task outcomes persisted per worker-thread hop
+_OUTCOME_BATCH_SIZE = 64
+
+
+def now_iso() -> str:
+    """Return the current local time as an ISO 8601 string.
+
+    Resolution is one second; the formatted string is cached for the
+    current second so hot paths (context appends, session updates) don't
+    build and format a datetime on every call.
+
+    Returns:
+        Timestamp such as "2025-01-31T12:00:05".
+    """
+    global _now_iso_cache
+    second = int(time.time())
+    cached_second, cached = _now_iso_cache
+    if second != cached_second:
+        cached = datetime.fromtimestamp(second).isoformat()
+        _now_iso_cache = (second, cached)
+    return cached
+
 
 class AgentMemory:
     """Agent persistent memory system using markdown and JSON."""
@@ -26,6 +66,11 @@ class AgentMemory:
         self.context_file = self.memory_dir / "context.md"
         self.results_dir = self.memory_dir / "results"
         self.results_dir.mkdir(exist_ok=True)
+        self.llm_cache_dir = self.memory_dir / "llm_cache"
+        self.llm_cache_dir.mkdir(exist_ok=True)
+        self._context_fd: Optional[int] = None
+        # Closes _context_fd when the memory is garbage collected or at exit
+        self._close_context: Optional[weakref.finalize] = None
 
     def save_session(self, session_data: Dict[str, Any]) -> None:
         """Persist session data to JSON file.
@@ -33,8 +78,8 @@ class AgentMemory:
         Args:
             session_data: Dictionary containing session information.
         """
-        with open(self.session_file, "w", encoding="utf-8") as f:
-            json.dump(session_data, f, indent=2, default=str)
+        with open(self.session_file, "wb") as f:
+            f.write(orjson.dumps(session_data, option=_JSON_OPTIONS, default=str))
 
     def load_session(self) -> Dict[str, Any]:
         """Load session data from JSON file.
@@ -43,8 +88,8 @@ class AgentMemory:
             Dictionary containing session data or empty dict if not found.
         """
         if self.session_file.exists():
-            with open(self.session_file, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(self.session_file, "rb") as f:
+                return orjson.loads(f.read())
         return {}
 
     def append_context(self, context_entry: str) -> None:
@@ -53,9 +98,24 @@ class AgentMemory:
         Args:
             context_entry: Markdown-formatted context entry.
         """
-        timestamp = datetime.now().isoformat()
-        with open(self.context_file, "a", encoding="utf-8") as f:
-            f.write(f"\n## {timestamp}\n{context_entry}\n\n")
+        timestamp = now_iso()
+        if self._context_fd is None:
+            # Held open between entries; O_APPEND makes each entry a single
+            # atomic write without reopening the file.
+            self._context_fd = os.open(
+                self.context_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+            )
+            self._close_context = weakref.finalize(self, os.close, self._context_fd)
+        os.write(
+            self._context_fd,
+            f"\n## {timestamp}\n{context_entry}\n\n".encode("utf-8"),
+        )
+
+    def close(self) -> None:
+        """Release the context file descriptor, if open."""
+        if self._context_fd is not None:
+            self._close_context()
+            self._context_fd = None
 
     def get_context(self) -> str:
         """Retrieve full context from markdown file.
@@ -76,13 +136,30 @@ class AgentMemory:
             result: Result data to save.
         """
         result_file = self.results_dir / f"result_{task_id}.json"
-        with open(result_file, "w", encoding="utf-8") as f:
-            json.dump(result, f, indent=2, default=str)
+        with open(result_file, "wb") as f:
+            f.write(orjson.dumps(result, option=_JSON_OPTIONS, default=str))
+
+
+# AsyncGroq clients keyed by API key
+_ClientsByKey = Dict[str, AsyncGroq]
 
 
 class BaseAgent(ABC):
     """Abstract base class for all agents."""
 
+    # Groq clients per event loop and API key, so every agent on a loop
+    # reuses the same connection pool instead of re-doing TLS setup on each
+    # call. Pooled connections belong to the loop that opened them, so a
+    # client is never shared across loops.
+    _clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _ClientsByKey]" = (
+        weakref.WeakKeyDictionary()
+    )
+    # One limiter per event loop, shared by every agent on that loop, so the
+    # total number of in-flight Groq requests stays within account limits
+    _limiters: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, RateLimiter]" = (
+        weakref.WeakKeyDictionary()
+    )
+
     def __init__(
         self,
         agent_id: str,
@@ -108,7 +185,21 @@ class BaseAgent(ABC):
         self.api_key = api_key
         self.model = model
         self.system_prompt = system_prompt
+        self._system_msg = {"role": "system", "content": system_prompt}
+        self.llm_cache = LLMCache(
+            self.memory.llm_cache_dir,
+            ttl_seconds=EnvironmentConfig.LLM_CACHE_TTL_SECONDS,
+        )
+        self.action_cache: Optional[ActionCache] = None
+        if EnvironmentConfig.ACTION_CACHE_ENABLED:
+            self.action_cache = ActionCache(
+                Path(EnvironmentConfig.MEMORY_DIR) / "action_cache"
+            )
         self.session = self.memory.load_session()
+        self._outcomes: Optional[asyncio.Queue] = None
+        self._outcome_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._outcome_writer: Optional[asyncio.Task] = None
+        self._outcome_lock = threading.Lock()
         self.logger = logging.getLogger(f"{self.__class__.__name__}:{agent_id}")
 
         # Initialize session if empty
@@ -116,7 +207,7 @@ class BaseAgent(ABC):
             self.session = {
                 "agent_id": agent_id,
                 "role": role,
-                "created_at": datetime.now().isoformat(),
+                "created_at": now_iso(),
                 "tasks_completed": 0,
             }
             self.memory.save_session(self.session)
@@ -133,31 +224,135 @@ class BaseAgent(ABC):
         """
         pass
 
-    def update_session(self, task_id: str, status: str) -> None:
-        """Update agent session with task information.
+    async def run_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a task, reusing the result of an identical earlier task.
+
+        When the action cache is enabled, a task whose role and payload
+        (ignoring task IDs and timestamps) match an earlier run returns
+        that run's result without executing. Set "no_cache" in the payload
+        to force execution.
 
         Args:
-            task_id: Task identifier.
-            status: Task status (completed, failed, etc.).
+            task: Task dictionary containing task details.
+
+        Returns:
+            Dictionary containing task execution results.
         """
+        if self.action_cache is None or task.get("no_cache"):
+            return await self.execute_task(task)
+
+        key = ActionCache.cache_key(self.role, task)
+        cached = await self.action_cache.get(key)
+        if cached is not None:
+            task_id = task.get("id", "unknown")
+            self.logger.info(f"Reusing cached result for task {task_id}")
+            result = {**cached, "task_id": task_id}
+            await self.record_task_outcome(task_id, "completed", result)
+            return result
+
+        result = await self.execute_task(task)
+        await self.action_cache.set(key, result)
+        return result
+
+    def _apply_session_update(self, task_id: str, status: str) -> None:
+        """Record a task in the in-memory session without saving it."""
         self.session["last_task_id"] = task_id
         self.session["last_task_status"] = status
-        self.session["last_updated"] = datetime.now().isoformat()
+        self.session["last_updated"] = now_iso()
         if status == "completed":
             self.session["tasks_completed"] = self.session.get("tasks_completed", 0) + 1
-        self.memory.save_session(self.session)
 
-    def save_task_result(self, task_id: str, result: Dict[str, Any]) -> None:
-        """Save task result to memory.
+    async def record_task_outcome(
+        self,
+        task_id: str,
+        status: str,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Queue a session update and result save without blocking the task.
+
+        Outcomes are written by a background writer that persists everything
+        queued since its last write in one worker-thread hop; call
+        flush_outcomes() to wait until they are on disk.
 
         Args:
             task_id: Task identifier.
-            result: Result data to save.
+            status: Task status (completed, failed, etc.).
+            result: Optional result data to save.
         """
-        self.memory.save_result(task_id, result)
-        self.memory.append_context(
-            f"Completed task {task_id}: {result.get('status', 'unknown')}"
-        )
+        loop = asyncio.get_running_loop()
+        if self._outcome_loop is not loop:
+            # Queues are bound to the loop that first uses them
+            self._outcomes = asyncio.Queue()
+            self._outcome_loop = loop
+            # Held so the writer task is not garbage collected while idle
+            self._outcome_writer = loop.create_task(self._write_outcomes())
+        self._outcomes.put_nowait((task_id, status, result))
+
+    async def flush_outcomes(self) -> None:
+        """Wait until every queued task outcome has been persisted."""
+        if self._outcome_loop is asyncio.get_running_loop():
+            await self._outcomes.join()
+
+    async def _write_outcomes(self) -> None:
+        """Persist queued task outcomes in batches until cancelled."""
+        queue = self._outcomes
+        while True:
+            batch = [await queue.get()]
+            while len(batch) < _OUTCOME_BATCH_SIZE and not queue.empty():
+                batch.append(queue.get_nowait())
+            # The session is only touched on the loop; the worker thread gets
+            # a snapshot of it
+            self._apply_session_updates(batch)
+            try:
+                await asyncio.to_thread(
+                    self._record_task_outcomes, batch, dict(self.session)
+                )
+            except asyncio.CancelledError:
+                # Shutting down while the batch is still being written by its
+                # worker thread; write whatever else is queued before exiting
+                rest = []
+                while not queue.empty():
+                    rest.append(queue.get_nowait())
+                batch.extend(rest)
+                if rest:
+                    self._apply_session_updates(rest)
+                    self._record_task_outcomes(rest, dict(self.session))
+                raise
+            except Exception as e:
+                self.logger.error(f"Failed to persist task outcomes: {e}")
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    def _apply_session_updates(
+        self, outcomes: List[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> None:
+        """Record a batch of task outcomes in the in-memory session."""
+        for task_id, status, _ in outcomes:
+            self._apply_session_update(task_id, status)
+
+    def _record_task_outcomes(
+        self,
+        outcomes: List[Tuple[str, str, Optional[Dict[str, Any]]]],
+        session: Dict[str, Any],
+    ) -> None:
+        """Synchronously persist task outcomes (see record_task_outcome).
+
+        The session file is written once for the whole batch.
+
+        Args:
+            outcomes: Queued (task_id, status, result) tuples.
+            session: Session snapshot that already includes the outcomes.
+        """
+        with self._outcome_lock:
+            self.memory.save_session(session)
+            for task_id, _, result in outcomes:
+                if result is None:
+                    continue
+                self.memory.save_result(task_id, result)
+                self.memory.append_context(
+                    f"Completed task {task_id}: {result.get('status', 'unknown')}"
+                )
 
     def get_tool_context(self) -> str:
         """Return available tools and their descriptions.
@@ -168,36 +363,217 @@ class BaseAgent(ABC):
         return self.memory.get_context()
 
     async def call_llm(
-        self, prompt: str, max_tokens: Optional[int] = None
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.7,
+        cache_ttl: Optional[float] = None,
     ) -> str:
         """Call LLM with given prompt using Groq.
 
+        Deterministic calls (temperature at most 0.1) are served from the
+        agent's LLM cache, so repeated prompts skip the network. Groq also
+        caches shared prompt prefixes, so prompts should put their static
+        text first and the per-call details last.
+
         Args:
             prompt: User prompt to send to LLM.
             max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+            cache_ttl: Seconds a cached response stays valid; defaults to
+                EnvironmentConfig.LLM_CACHE_TTL_SECONDS.
 
         Returns:
             LLM response text.
         """
+        max_tokens = max_tokens or 4096
+        messages = [self._system_msg, {"role": "user", "content": prompt}]
+        cache_key = LLMCache.cache_key(self.model, messages, temperature, max_tokens)
+        if cache_key is not None:
+            cached = await self.llm_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
         try:
-            from groq import Groq
-
-            client = Groq(api_key=self.api_key)
-            
-            # Combine system prompt and user prompt
-            full_prompt = f"{self.system_prompt}\n\n{prompt}"
-            
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens or 4096,
-                temperature=0.7,
-            )
-            return response.choices[0].message.content
+            client = self._get_client()
+            async with self._get_limiter().slot():
+                response = await client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+            content = response.choices[0].message.content
         except Exception as e:
             self.logger.error(f"LLM call failed: {str(e)}")
             raise
 
+        self._log_usage(response)
+        if cache_key is not None and content:
+            usage = getattr(response, "usage", None)
+            await self.llm_cache.set(
+                cache_key, content, getattr(usage, "total_tokens", 0), cache_ttl
+            )
+        return content
+
+    async def call_llm_stream(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[str]:
+        """Call LLM and yield the response text as it is generated.
+
+        Streamed calls are not cached; use call_llm() for deterministic
+        prompts that benefit from the LLM cache.
+
+        The request holds a rate limiter slot until the stream ends. A
+        caller that may stop iterating early must close the generator with
+        aclose(), or the slot stays taken until it is garbage collected.
+
+        Args:
+            prompt: User prompt to send to LLM.
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Yields:
+            Response text fragments in order.
+        """
+        try:
+            client = self._get_client()
+            async with self._get_limiter().slot():
+                stream = await client.chat.completions.create(
+                    model=self.model,
+                    messages=[self._system_msg, {"role": "user", "content": prompt}],
+                    max_tokens=max_tokens or 4096,
+                    temperature=temperature,
+                    stream=True,
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except Exception as e:
+            self.logger.error(f"LLM stream failed: {str(e)}")
+            raise
+
+    async def call_llm_tool(
+        self,
+        prompt: str,
+        tool: Dict[str, Any],
+        max_tokens: Optional[int] = None,
+        temperature: float = 0.0,
+        cache_ttl: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """Call LLM and have it answer by calling a single function tool.
+
+        The model is forced to call the tool, so the answer comes back as
+        structured arguments instead of free text. Deterministic calls are
+        cached like call_llm().
+
+        Args:
+            prompt: User prompt to send to LLM.
+            tool: Function definition with "name", "description" and
+                "parameters" (a JSON schema).
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+            cache_ttl: Seconds a cached response stays valid; defaults to
+                EnvironmentConfig.LLM_CACHE_TTL_SECONDS.
+
+        Returns:
+            Parsed tool call arguments.
+        """
+        max_tokens = max_tokens or 4096
+        messages = [self._system_msg, {"role": "user", "content": prompt}]
+        tools = [{"type": "function", "function": tool}]
+        cache_key = LLMCache.cache_key(
+            self.model, messages, temperature, max_tokens, tools
+        )
+        if cache_key is not None:
+            cached = await self.llm_cache.get(cache_key)
+            if cached is not None:
+                return orjson.loads(cached)
+
+        try:
+            client = self._get_client()
+            async with self._get_limiter().slot():
+                response = await client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    tools=tools,
+                    tool_choice={
+                        "type": "function",
+                        "function": {"name": tool["name"]},
+                    },
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+            arguments = response.choices[0].message.tool_calls[0].function.arguments
+            parsed = orjson.loads(arguments)
+        except Exception as e:
+            self.logger.error(f"LLM tool call failed: {str(e)}")
+            raise
+
+        self._log_usage(response)
+        if cache_key is not None:
+            usage = getattr(response, "usage", None)
+            await self.llm_cache.set(
+                cache_key, arguments, getattr(usage, "total_tokens", 0), cache_ttl
+            )
+        return parsed
+
+    def _log_usage(self, response: Any) -> None:
+        """Log prompt token usage, including tokens served from the prompt cache.
+
+        Groq caches shared prompt prefixes automatically, so prompts that
+        keep their static text first report part of their input as cached.
+
+        Args:
+            response: Chat completion response.
+        """
+        usage = getattr(response, "usage", None)
+        if usage is None:
+            return
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", 0) or 0
+        self.logger.debug(
+            f"LLM usage: prompt_tokens={usage.prompt_tokens} "
+            f"cached_tokens={cached} completion_tokens={usage.completion_tokens}"
+        )
+
+    def _get_limiter(self) -> RateLimiter:
+        """Return the request limiter shared by all agents on this event loop.
+
+        Returns:
+            RateLimiter sized from EnvironmentConfig, created on first use.
+        """
+        loop = asyncio.get_running_loop()
+        limiter = BaseAgent._limiters.get(loop)
+        if limiter is None:
+            limiter = RateLimiter(
+                EnvironmentConfig.GROQ_MAX_CONCURRENCY,
+                EnvironmentConfig.GROQ_REQUESTS_PER_MINUTE,
+            )
+            BaseAgent._limiters[loop] = limiter
+        return limiter
+
+    def _get_client(self) -> AsyncGroq:
+        """Return the async Groq client shared on this event loop.
+
+        Returns:
+            Cached AsyncGroq client for this agent's API key, created on
+            first use.
+        """
+        clients = BaseAgent._clients.setdefault(asyncio.get_running_loop(), {})
+        client = clients.get(self.api_key)
+        if client is None:
+            client = AsyncGroq(
+                api_key=self.api_key,
+                max_retries=EnvironmentConfig.MAX_RETRIES,
+                timeout=httpx.Timeout(float(EnvironmentConfig.TIMEOUT_SECONDS)),
+                http_client=httpx.AsyncClient(
+                    limits=httpx.Limits(max_keepalive_connections=20),
+                    timeout=httpx.Timeout(float(EnvironmentConfig.TIMEOUT_SECONDS)),
+                ),
+            )
+            clients[self.api_key] = client
+        return client
@@ -1,13 +1,92 @@
 """Coordinator agent for orchestrating multi-agent workflows."""
 
-from datetime import datetime
+import io
+import re
+import reprlib
+from collections import Counter
 from typing import Any, Dict, List, Optional
 import logging
 
-from src.agents.base_agent import BaseAgent
+from src.agents.base_agent import BaseAgent, now_iso
 
 logger = logging.getLogger(__name__)
 
+_ROUTABLE_AGENTS = ("researcher", "analyst", "writer", "seo", "quality")
+# Function tool the routing call must answer with, so the decision comes
+# back as structured arguments rather than prose that has to be parsed
+_ROUTE_TASK_TOOL = {
+    "name": "route_task",
+    "description": "Assign the task to the agent best suited to handle it.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "agent": {"type": "string", "enum": list(_ROUTABLE_AGENTS)},
+            "reasoning": {
+                "type": "string",
+                "description": "One or two sentences explaining the choice.",
+            },
+        },
+        "required": ["agent", "reasoning"],
+    },
+}
+
+# Validation sentiment terms; "unacceptable" is listed before "acceptable"
+# so it is only counted as negative
+_SENTIMENT_RE = re.compile(
+    r"unacceptable|acceptable|pass|meets|good|fail|poor", re.IGNORECASE
+)
+_POSITIVE_TERMS = ("pass", "meets", "good", "acceptable")
+_NEGATIVE_TERMS = ("fail", "poor", "unacceptable")
+
+# Budget for the work summary sent with validation prompts. Long text
+# fields keep their head and tail, which carry most structure signals
+# (intro, conclusion); nested values are abbreviated by reprlib.
+_WORK_SUMMARY_CHARS = 1000
+_TEXT_EDGE_CHARS = 400
+_WORK_REPR = reprlib.Repr()
+_WORK_REPR.maxlevel = 2
+_WORK_REPR.maxdict = 8
+_WORK_REPR.maxlist = 8
+_WORK_REPR.maxstring = 120
+_WORK_REPR.maxother = 120
+
+# Routing instructions; the task details are appended at the end
+_ROUTING_PROMPT = """Determine the best agent to handle this task.
+
+Available Agents:
+- researcher: For gathering information and research
+- analyst: For data analysis and synthesis
+- writer: For content creation
+- seo: For SEO optimization
+- quality: For quality assurance
+
+Call route_task with the agent that should handle this task and your reasoning.
+
+"""
+_VALIDATION_PROMPT = """Review the following work output and validate quality.
+
+Assess:
+1. Completeness
+2. Accuracy
+3. Quality
+4. Meets requirements
+
+Provide validation assessment.
+
+"""
+_PIPELINE_PROMPT = """Plan the execution of a content pipeline.
+
+The pipeline should include:
+1. Research phase
+2. Analysis phase
+3. Writing phase
+4. SEO optimization phase
+5. Quality assurance phase
+
+Provide execution plan with task dependencies and sequencing.
+
+"""
+
 
 class CoordinatorAgent(BaseAgent):
     """Primary coordinator agent for task routing and workflow management."""
@@ -35,6 +114,12 @@ class CoordinatorAgent(BaseAgent):
         """
         super().__init__(agent_id, role, memory_dir, api_key, model, system_prompt)
         self.available_agents = available_agents
+        # Task type -> handler; unknown types fall back to _coordinate_workflow
+        self._handlers = {
+            "route": self._route_task,
+            "validate": self._validate_work,
+            "monitor": self._monitor_agents,
+        }
 
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute coordination task.
@@ -51,23 +136,16 @@ class CoordinatorAgent(BaseAgent):
         self.logger.info(f"Coordinator executing task: {task_type}")
 
         try:
-            if task_type == "route":
-                result = await self._route_task(task)
-            elif task_type == "validate":
-                result = await self._validate_work(task)
-            elif task_type == "monitor":
-                result = await self._monitor_agents(task)
-            else:
-                result = await self._coordinate_workflow(task)
+            handler = self._handlers.get(task_type, self._coordinate_workflow)
+            result = await handler(task)
 
-            self.update_session(task_id, "completed")
-            self.save_task_result(task_id, result)
+            await self.record_task_outcome(task_id, "completed", result)
 
             return result
 
         except Exception as e:
             self.logger.error(f"Coordination task failed: {str(e)}")
-            self.update_session(task_id, "failed")
+            await self.record_task_outcome(task_id, "failed")
             raise
 
     async def _route_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
@@ -82,30 +160,24 @@ class CoordinatorAgent(BaseAgent):
         task_description = task.get("description", "")
         task_requirements = task.get("requirements", [])
 
-        prompt = f"""Determine the best agent to handle this task:
-
-Task Description: {task_description}
-Requirements: {', '.join(task_requirements)}
-
-Available Agents:
-- researcher: For gathering information and research
-- analyst: For data analysis and synthesis
-- writer: For content creation
-- seo: For SEO optimization
-- quality: For quality assurance
-
-Which agent should handle this task? Provide reasoning."""
+        prompt = (
+            f"{_ROUTING_PROMPT}Task Description: {task_description}\n"
+            f"Requirements: {', '.join(task_requirements)}"
+        )
 
         try:
-            decision = await self.call_llm(prompt, max_tokens=512)
-            # Extract agent recommendation
-            recommended_agent = self._extract_agent_recommendation(decision)
+            decision = await self.call_llm_tool(
+                prompt, _ROUTE_TASK_TOOL, max_tokens=256, temperature=0
+            )
+            recommended_agent = decision.get("agent")
+            if recommended_agent not in _ROUTABLE_AGENTS:
+                recommended_agent = "researcher"  # Default
 
             return {
                 "status": "routed",
                 "recommended_agent": recommended_agent,
-                "reasoning": decision,
-                "timestamp": datetime.now().isoformat(),
+                "reasoning": decision.get("reasoning", ""),
+                "timestamp": now_iso(),
             }
         except Exception as e:
             self.logger.warning(f"Routing decision had issues: {e}")
@@ -115,28 +187,6 @@ Which agent should handle this task? Provide reasoning."""
                 "reasoning": "Default routing",
             }
 
-    def _extract_agent_recommendation(self, text: str) -> str:
-        """Extract agent recommendation from text.
-
-        Args:
-            text: Decision text.
-
-        Returns:
-            Agent identifier.
-        """
-        text_lower = text.lower()
-        if "researcher" in text_lower or "research" in text_lower:
-            return "researcher"
-        elif "analyst" in text_lower or "analysis" in text_lower:
-            return "analyst"
-        elif "writer" in text_lower or "write" in text_lower:
-            return "writer"
-        elif "seo" in text_lower:
-            return "seo"
-        elif "quality" in text_lower or "qa" in text_lower:
-            return "quality"
-        return "researcher"  # Default
-
     async def _validate_work(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Validate work quality from agents.
 
@@ -149,21 +199,15 @@ Which agent should handle this task? Provide reasoning."""
         work_data = task.get("work_data", {})
         quality_threshold = task.get("quality_threshold", 70)
 
-        prompt = f"""Review the following work output and validate quality:
-
-Work Data: {str(work_data)[:1000]}...
-Quality Threshold: {quality_threshold}/100
-
-Assess:
-1. Completeness
-2. Accuracy
-3. Quality
-4. Meets requirements
-
-Provide validation assessment."""
+        prompt = (
+            f"{_VALIDATION_PROMPT}Quality Threshold: {quality_threshold}/100\n"
+            f"Work Data: {self._summarize_work_for_validation(work_data)}"
+        )
 
         try:
-            assessment = await self.call_llm(prompt, max_tokens=1024)
+            assessment = await self.call_llm(
+                prompt, max_tokens=1024, temperature=0
+            )
             # Determine if work passes
             passes = self._determine_validation_result(assessment, quality_threshold)
 
@@ -172,7 +216,7 @@ Provide validation assessment."""
                 "passes": passes,
                 "assessment": assessment,
                 "quality_threshold": quality_threshold,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
             }
         except Exception as e:
             self.logger.warning(f"Validation had issues: {e}")
@@ -182,6 +226,40 @@ Provide validation assessment."""
                 "assessment": "Validation completed",
             }
 
+    def _summarize_work_for_validation(self, work_data: Any) -> str:
+        """Summarize work output for the validation prompt.
+
+        Fields are added one at a time until the character budget is
+        spent, so large outputs are never serialized in full.
+
+        Args:
+            work_data: Work output to summarize.
+
+        Returns:
+            Summary of at most _WORK_SUMMARY_CHARS characters.
+        """
+        if not isinstance(work_data, dict):
+            return _WORK_REPR.repr(work_data)[:_WORK_SUMMARY_CHARS]
+
+        buf = io.StringIO()
+        for key, value in work_data.items():
+            if isinstance(value, str):
+                if len(value) > 2 * _TEXT_EDGE_CHARS:
+                    value = (
+                        f"{value[:_TEXT_EDGE_CHARS]}...{value[-_TEXT_EDGE_CHARS:]}"
+                    )
+                text = value
+            else:
+                text = _WORK_REPR.repr(value)
+
+            line = f"{key}: {text}\n"
+            remaining = _WORK_SUMMARY_CHARS - buf.tell()
+            if len(line) >= remaining:
+                buf.write(line[:remaining])
+                break
+            buf.write(line)
+        return buf.getvalue()
+
     def _determine_validation_result(
         self, assessment: str, threshold: int
     ) -> bool:
@@ -195,17 +273,9 @@ Provide validation assessment."""
             True if work passes, False otherwise.
         """
         # Simple heuristic - look for positive indicators
-        positive = (
-            assessment.lower().count("pass")
-            + assessment.lower().count("meets")
-            + assessment.lower().count("good")
-            + assessment.lower().count("acceptable")
-        )
-        negative = (
-            assessment.lower().count("fail")
-            + assessment.lower().count("poor")
-            + assessment.lower().count("unacceptable")
-        )
+        counts = Counter(term.lower() for term in _SENTIMENT_RE.findall(assessment))
+        positive = sum(counts[term] for term in _POSITIVE_TERMS)
+        negative = sum(counts[term] for term in _NEGATIVE_TERMS)
 
         return positive > negative
 
@@ -218,6 +288,8 @@ Provide validation assessment."""
         Returns:
             Monitoring results dictionary.
         """
+        # Timestamp the snapshot as of when it was taken
+        timestamp = now_iso()
         agent_statuses = {}
 
         for agent_id, agent in self.available_agents.items():
@@ -234,7 +306,7 @@ Provide validation assessment."""
             "status": "monitored",
             "agent_statuses": agent_statuses,
             "total_agents": len(self.available_agents),
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": timestamp,
         }
 
     async def _coordinate_workflow(self, task: Dict[str, Any]) -> Dict[str, Any]:
@@ -271,18 +343,11 @@ Provide validation assessment."""
         """
         topic = parameters.get("topic", "Unknown Topic")
 
-        prompt = f"""Plan the execution of a content pipeline for topic: {topic}
-
-The pipeline should include:
-1. Research phase
-2. Analysis phase
-3. Writing phase
-4. SEO optimization phase
-5. Quality assurance phase
-
-Provide execution plan with task dependencies and sequencing."""
+        prompt = f"{_PIPELINE_PROMPT}Topic: {topic}"
 
         try:
+            # The plan is only used whole, so there is nothing to gain from
+            # streaming it; a buffered call also leaves the loop free
             plan = await self.call_llm(prompt, max_tokens=1024)
             return {
                 "status": "planned",
@@ -295,7 +360,7 @@ Provide execution plan with task dependencies and sequencing."""
                     "seo_optimization",
                     "quality_assurance",
                 ],
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
             }
         except Exception as e:
             self.logger.warning(f"Pipeline planning had issues: {e}")
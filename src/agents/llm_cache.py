@@ -0,0 +1,202 @@
+"""Exact-match response cache for deterministic LLM calls."""
+
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# Calls sampled above this temperature are not reproducible enough to cache
+MAX_CACHEABLE_TEMPERATURE = 0.1
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for an LLM cache."""
+
+    hits: int = 0
+    misses: int = 0
+    tokens_saved: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __add__(self, other: "CacheStats") -> "CacheStats":
+        return CacheStats(
+            self.hits + other.hits,
+            self.misses + other.misses,
+            self.tokens_saved + other.tokens_saved,
+        )
+
+
+def _normalize_text(text: Any) -> Any:
+    """Strip surrounding whitespace from message text.
+
+    Whitespace inside the text is kept: line breaks and indentation can be
+    part of what a prompt asks about, such as an article under review.
+    Other values pass through.
+    """
+    if isinstance(text, str):
+        return text.strip()
+    return text
+
+
+class LLMCache:
+    """Two-level (in-memory LRU + on-disk) cache of LLM completions.
+
+    Entries are keyed by a hash of the full request, so a hit is only
+    returned for the same model, message text (up to surrounding
+    whitespace) and sampling settings. Entries older than their
+    time-to-live are ignored.
+    """
+
+    def __init__(
+        self, cache_dir: Path, max_entries: int = 256, ttl_seconds: float = 0
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per cached completion.
+            max_entries: Maximum number of completions kept in memory.
+            ttl_seconds: Default lifetime of new entries; 0 keeps them
+                until evicted.
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        # key -> (content, tokens, expiry epoch seconds or 0 for none)
+        self._entries: "OrderedDict[str, Tuple[str, int, float]]" = OrderedDict()
+        self.stats = CacheStats()
+
+    @staticmethod
+    def cache_key(
+        model: str,
+        messages: List[Dict[str, Any]],
+        temperature: float,
+        max_tokens: Optional[int] = None,
+        tools: Optional[List[Dict[str, Any]]] = None,
+    ) -> Optional[str]:
+        """Build the cache key for a request.
+
+        Args:
+            model: Model identifier.
+            messages: Chat messages sent to the model.
+            temperature: Sampling temperature.
+            max_tokens: Maximum tokens in the response.
+            tools: Tool definitions sent with the request.
+
+        Returns:
+            Hex digest identifying the request, or None if the request is
+            sampled too randomly to be cached.
+        """
+        if temperature > MAX_CACHEABLE_TEMPERATURE:
+            return None
+        payload = {
+            "model": model,
+            "messages": [
+                {**message, "content": _normalize_text(message.get("content"))}
+                for message in messages
+            ],
+            "temperature": float(temperature),
+            "max_tokens": max_tokens,
+            "tools": tools,
+        }
+        return hashlib.sha256(
+            orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+        ).hexdigest()
+
+    async def get(self, key: str) -> Optional[str]:
+        """Look up a cached completion.
+
+        Args:
+            key: Cache key from cache_key().
+
+        Returns:
+            Cached completion text, or None on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = await asyncio.to_thread(self._read_entry, key)
+            if entry is not None:
+                self._remember(key, entry)
+        else:
+            self._entries.move_to_end(key)
+
+        if entry is not None and 0 < entry[2] <= time.time():
+            # Expired; the next set() for this key replaces it
+            self._entries.pop(key, None)
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            logger.debug(f"LLM cache miss: {key[:12]}")
+            return None
+
+        content, tokens, _ = entry
+        self.stats.hits += 1
+        self.stats.tokens_saved += tokens
+        logger.info(f"LLM cache hit: {key[:12]} ({tokens} tokens saved)")
+        return content
+
+    async def set(
+        self,
+        key: str,
+        content: str,
+        tokens: int = 0,
+        ttl_seconds: Optional[float] = None,
+    ) -> None:
+        """Store a completion.
+
+        Args:
+            key: Cache key from cache_key().
+            content: Completion text.
+            tokens: Total tokens the request consumed, reported on later hits.
+            ttl_seconds: Lifetime of this entry; defaults to the cache's
+                ttl_seconds, and 0 keeps it until evicted.
+        """
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        entry = (content, tokens, time.time() + ttl if ttl > 0 else 0.0)
+        self._remember(key, entry)
+        await asyncio.to_thread(self._write_entry, key, entry)
+
+    def _remember(self, key: str, entry: Tuple[str, int, float]) -> None:
+        """Add an entry to the in-memory LRU, evicting the oldest if full."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read_entry(self, key: str) -> Optional[Tuple[str, int, float]]:
+        """Read an entry from disk."""
+        try:
+            with open(self.cache_dir / f"{key}.json", "rb") as f:
+                data = orjson.loads(f.read())
+            return data["content"], data.get("tokens", 0), data.get("expires_at", 0.0)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Failed to read LLM cache entry {key[:12]}: {e}")
+            return None
+
+    def _write_entry(self, key: str, entry: Tuple[str, int, float]) -> None:
+        """Write an entry to disk."""
+        content, tokens, expires_at = entry
+        try:
+            with open(self.cache_dir / f"{key}.json", "wb") as f:
+                f.write(
+                    orjson.dumps(
+                        {"content": content, "tokens": tokens, "expires_at": expires_at}
+                    )
+                )
+        except OSError as e:
+            logger.warning(f"Failed to cache LLM response: {e}")
@@ -1,13 +1,142 @@
 """Quality assurance agent for content validation."""
 
-from datetime import datetime
-from typing import Any, Dict, List
+import asyncio
+import io
+import re
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Tuple
 import logging
 
-from src.agents.base_agent import BaseAgent
+from src.agents.base_agent import BaseAgent, now_iso
 
 logger = logging.getLogger(__name__)
 
+# Results used when a sub-check cannot run
+_GRAMMAR_FALLBACK: Mapping[str, Any] = MappingProxyType(
+    {
+        "status": "completed",
+        "issues_found": 0,
+        "feedback": "Grammar check completed",
+        "score": 85,
+    }
+)
+_FACT_FALLBACK: Mapping[str, Any] = MappingProxyType(
+    {
+        "status": "reviewed",
+        "issues_found": 0,
+        "feedback": "Fact check completed",
+        "score": 90,
+    }
+)
+_STYLE_FALLBACK: Mapping[str, Any] = MappingProxyType(
+    {"status": "completed", "feedback": "Style check completed", "score": 80}
+)
+_SEO_FALLBACK: Mapping[str, Any] = MappingProxyType(
+    {
+        "status": "validated",
+        "seo_score": 0,
+        "issues": ("SEO validation could not be completed",),
+        "score": 0,
+    }
+)
+_CHECK_FALLBACKS = (_GRAMMAR_FALLBACK, _FACT_FALLBACK, _STYLE_FALLBACK)
+
+# Single tool call covering the grammar, fact and style reviews, so the
+# content is sent to the model once instead of once per check
+_REVIEW_SECTION = {
+    "type": "object",
+    "properties": {
+        "issues_found": {"type": "integer", "minimum": 0},
+        "feedback": {"type": "string"},
+        "score": {"type": "integer", "minimum": 0, "maximum": 100},
+    },
+    "required": ["issues_found", "feedback", "score"],
+}
+_SUBMIT_REVIEW_TOOL = {
+    "name": "submit_review",
+    "description": "Submit the grammar, factual accuracy and style review.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "grammar": _REVIEW_SECTION,
+            "facts": _REVIEW_SECTION,
+            "style": _REVIEW_SECTION,
+        },
+        "required": ["grammar", "facts", "style"],
+    },
+}
+
+# Feedback keywords counted by the sub-check heuristics. Matching is by
+# substring, so "errors" and "unclear" count as well
+_GRAMMAR_RE = re.compile(r"error|issue", re.IGNORECASE)
+_FACT_RE = re.compile(r"inaccurate|unsupported", re.IGNORECASE)
+_STYLE_RE = re.compile(r"clear|engaging|consistent", re.IGNORECASE)
+
+# Content characters sent to the model for review
+_REVIEW_EXCERPT_CHARS = 2000
+# Feedback characters quoted per section of the quality report
+_REPORT_FEEDBACK_CHARS = 200
+
+# Text shared by every check on the same content; the per-check question
+# goes last
+_REVIEW_PREFIX = "Review the draft content below.\n\nContent:\n"
+_COMBINED_TASK = """Review the content for grammar and spelling, factual accuracy, and style and tone.
+
+For grammar, identify grammar errors, spelling mistakes, punctuation issues
+and sentence structure problems, with specific corrections.
+For facts, identify unsupported claims, potential inaccuracies, statements
+needing verification and contradictory information.
+For style, assess tone consistency, clarity and readability, use of
+language, flow and transitions, and engagement.
+
+Score each section out of 100 and call submit_review."""
+_GRAMMAR_TASK = """Review the content for grammar and spelling errors.
+
+Identify:
+1. Grammar errors
+2. Spelling mistakes
+3. Punctuation issues
+4. Sentence structure problems
+
+Provide detailed feedback with specific corrections."""
+_FACT_TASK = """Review the content for factual accuracy.
+
+Identify:
+1. Unsupported claims
+2. Potential inaccuracies
+3. Statements needing verification
+4. Contradictory information
+
+Provide assessment of factual reliability."""
+_STYLE_TASK = """Review the content for style and tone.
+
+Assess:
+1. Consistency in tone
+2. Clarity and readability
+3. Appropriate use of language
+4. Flow and transitions
+5. Engagement level
+
+Provide style assessment."""
+
+
+def _review_prompt(excerpt: str, task: str) -> str:
+    """Build a review prompt with the content ahead of the check question.
+
+    Args:
+        excerpt: Leading part of the content under review.
+        task: Check-specific instructions.
+
+    Returns:
+        Prompt text.
+    """
+    return f"{_REVIEW_PREFIX}{excerpt}...\n\n{task}"
+
+
+def _clamp_score(score: Any) -> int:
+    """Coerce a model-reported score into the 0-100 range."""
+    return max(0, min(int(score), 100))
+
 
 class QualityAgent(BaseAgent):
     """Quality assurance agent for content validation."""
@@ -22,23 +151,29 @@ class QualityAgent(BaseAgent):
             Dictionary with quality check results.
         """
         content = task.get("content", "")
+        # The LLM reviews only see the start of the content
+        excerpt = content[:_REVIEW_EXCERPT_CHARS]
         seo_data = task.get("seo_data", {})
         task_id = task.get("id", "unknown")
 
         self.logger.info("Starting quality assurance check")
 
         try:
-            # Grammar and spelling check
-            grammar_check = await self._check_grammar(content)
-
-            # Factual accuracy check
-            fact_check = await self._check_facts(content)
-
-            # Style and tone check
-            style_check = await self._check_style(content)
-
-            # SEO validation
-            seo_validation = await self._validate_seo(content, seo_data)
+            try:
+                grammar_check, fact_check, style_check = await self._combined_check(
+                    excerpt
+                )
+            except Exception as e:
+                self.logger.warning(
+                    f"Combined review failed, running checks separately: {e}"
+                )
+                grammar_check, fact_check, style_check = await self._separate_checks(
+                    excerpt
+                )
+            try:
+                seo_validation = await self._validate_seo(content, seo_data)
+            except Exception as e:
+                seo_validation = self._check_or_fallback(e, _SEO_FALLBACK)
 
             # Overall quality score
             quality_score = self._calculate_quality_score(
@@ -64,45 +199,109 @@ class QualityAgent(BaseAgent):
                 "recommendations": self._generate_recommendations(
                     grammar_check, fact_check, style_check, seo_validation
                 ),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
             }
 
-            self.update_session(task_id, "completed")
-            self.save_task_result(task_id, result)
+            await self.record_task_outcome(task_id, "completed", result)
 
             self.logger.info(f"Quality check completed: Score {quality_score}/100")
             return result
 
         except Exception as e:
             self.logger.error(f"Quality check failed: {str(e)}")
-            self.update_session(task_id, "failed")
+            await self.record_task_outcome(task_id, "failed")
             raise
 
-    async def _check_grammar(self, content: str) -> Dict[str, Any]:
-        """Check grammar and spelling.
+    async def _combined_check(self, excerpt: str) -> Tuple[Dict[str, Any], ...]:
+        """Run the grammar, fact and style reviews in one LLM call.
 
         Args:
-            content: Content to check.
+            excerpt: Leading part of the content to review.
 
         Returns:
-            Dictionary with grammar check results.
+            Grammar, fact and style check results.
         """
-        prompt = f"""Review the following content for grammar and spelling errors:
+        prompt = _review_prompt(excerpt, _COMBINED_TASK)
 
-{content[:2000]}...
+        review = await self.call_llm_tool(
+            prompt, _SUBMIT_REVIEW_TOOL, max_tokens=3072, temperature=0
+        )
+        grammar, facts, style = review["grammar"], review["facts"], review["style"]
+        return (
+            {
+                "status": "completed",
+                "issues_found": min(int(grammar["issues_found"]), 10),
+                "feedback": grammar["feedback"],
+                "score": _clamp_score(grammar["score"]),
+            },
+            {
+                "status": "reviewed",
+                "issues_found": min(int(facts["issues_found"]), 5),
+                "feedback": facts["feedback"],
+                "score": _clamp_score(facts["score"]),
+            },
+            {
+                "status": "completed",
+                "feedback": style["feedback"],
+                "score": _clamp_score(style["score"]),
+            },
+        )
 
-Identify:
-1. Grammar errors
-2. Spelling mistakes
-3. Punctuation issues
-4. Sentence structure problems
+    async def _separate_checks(self, excerpt: str) -> Tuple[Dict[str, Any], ...]:
+        """Run the grammar, fact and style checks as separate LLM calls.
 
-Provide detailed feedback with specific corrections."""
+        The checks are independent, so they run concurrently; a check that
+        raises falls back to its default result.
+
+        Args:
+            excerpt: Leading part of the content to review.
+
+        Returns:
+            Grammar, fact and style check results.
+        """
+        checks = await asyncio.gather(
+            self._check_grammar(excerpt),
+            self._check_facts(excerpt),
+            self._check_style(excerpt),
+            return_exceptions=True,
+        )
+        return tuple(
+            self._check_or_fallback(check, fallback)
+            for check, fallback in zip(checks, _CHECK_FALLBACKS)
+        )
+
+    def _check_or_fallback(
+        self, check: Any, fallback: Mapping[str, Any]
+    ) -> Dict[str, Any]:
+        """Return a sub-check result, or its fallback if the check raised.
+
+        Args:
+            check: Sub-check result or the exception it raised.
+            fallback: Default result for the sub-check.
+
+        Returns:
+            Sub-check result dictionary.
+        """
+        if isinstance(check, Exception):
+            self.logger.warning(f"Quality sub-check failed: {check}")
+            return dict(fallback)
+        return check
+
+    async def _check_grammar(self, excerpt: str) -> Dict[str, Any]:
+        """Check grammar and spelling.
+
+        Args:
+            excerpt: Leading part of the content to check.
+
+        Returns:
+            Dictionary with grammar check results.
+        """
+        prompt = _review_prompt(excerpt, _GRAMMAR_TASK)
 
         try:
-            feedback = await self.call_llm(prompt, max_tokens=1024)
+            feedback = await self.call_llm(prompt, max_tokens=1024, temperature=0)
             # Count issues (simple heuristic)
-            issues = feedback.lower().count("error") + feedback.lower().count("issue")
+            issues = len(_GRAMMAR_RE.findall(feedback))
             return {
                 "status": "completed",
                 "issues_found": min(issues, 10),
@@ -111,39 +310,22 @@ Provide detailed feedback with specific corrections."""
             }
         except Exception as e:
             self.logger.warning(f"Grammar check had issues: {e}")
-            return {
-                "status": "completed",
-                "issues_found": 0,
-                "feedback": "Grammar check completed",
-                "score": 85,
-            }
+            return dict(_GRAMMAR_FALLBACK)
 
-    async def _check_facts(self, content: str) -> Dict[str, Any]:
+    async def _check_facts(self, excerpt: str) -> Dict[str, Any]:
         """Check factual accuracy.
 
         Args:
-            content: Content to fact-check.
+            excerpt: Leading part of the content to fact-check.
 
         Returns:
             Dictionary with fact-check results.
         """
-        prompt = f"""Review the following content for factual accuracy:
-
-{content[:2000]}...
-
-Identify:
-1. Unsupported claims
-2. Potential inaccuracies
-3. Statements needing verification
-4. Contradictory information
-
-Provide assessment of factual reliability."""
+        prompt = _review_prompt(excerpt, _FACT_TASK)
 
         try:
-            feedback = await self.call_llm(prompt, max_tokens=1024)
-            issues = feedback.lower().count("inaccurate") + feedback.lower().count(
-                "unsupported"
-            )
+            feedback = await self.call_llm(prompt, max_tokens=1024, temperature=0)
+            issues = len(_FACT_RE.findall(feedback))
             return {
                 "status": "reviewed",
                 "issues_found": min(issues, 5),
@@ -152,43 +334,23 @@ Provide assessment of factual reliability."""
             }
         except Exception as e:
             self.logger.warning(f"Fact check had issues: {e}")
-            return {
-                "status": "reviewed",
-                "issues_found": 0,
-                "feedback": "Fact check completed",
-                "score": 90,
-            }
+            return dict(_FACT_FALLBACK)
 
-    async def _check_style(self, content: str) -> Dict[str, Any]:
+    async def _check_style(self, excerpt: str) -> Dict[str, Any]:
         """Check writing style and tone.
 
         Args:
-            content: Content to check.
+            excerpt: Leading part of the content to check.
 
         Returns:
             Dictionary with style check results.
         """
-        prompt = f"""Review the following content for style and tone:
-
-{content[:2000]}...
-
-Assess:
-1. Consistency in tone
-2. Clarity and readability
-3. Appropriate use of language
-4. Flow and transitions
-5. Engagement level
-
-Provide style assessment."""
+        prompt = _review_prompt(excerpt, _STYLE_TASK)
 
         try:
-            feedback = await self.call_llm(prompt, max_tokens=1024)
+            feedback = await self.call_llm(prompt, max_tokens=1024, temperature=0)
             # Positive indicators
-            positive = (
-                feedback.lower().count("clear")
-                + feedback.lower().count("engaging")
-                + feedback.lower().count("consistent")
-            )
+            positive = len(_STYLE_RE.findall(feedback))
             return {
                 "status": "completed",
                 "feedback": feedback,
@@ -196,11 +358,7 @@ Provide style assessment."""
             }
         except Exception as e:
             self.logger.warning(f"Style check had issues: {e}")
-            return {
-                "status": "completed",
-                "feedback": "Style check completed",
-                "score": 80,
-            }
+            return dict(_STYLE_FALLBACK)
 
     async def _validate_seo(
         self, content: str, seo_data: Dict[str, Any]
@@ -217,6 +375,9 @@ Provide style assessment."""
         seo_score = seo_data.get("seo_score", 0)
         keywords = seo_data.get("keywords", {})
         metadata = seo_data.get("metadata", {})
+        # A missing title or description counts as too short
+        title = metadata.get("title") or ""
+        description = metadata.get("description") or ""
 
         issues = []
 
@@ -226,10 +387,10 @@ Provide style assessment."""
         if not keywords.get("primary"):
             issues.append("Missing primary keyword")
 
-        if not metadata.get("title") or len(metadata.get("title", "")) < 30:
+        if len(title) < 30:
             issues.append("Meta title needs optimization")
 
-        if not metadata.get("description") or len(metadata.get("description", "")) < 100:
+        if len(description) < 100:
             issues.append("Meta description needs improvement")
 
         return {
@@ -292,30 +453,23 @@ Provide style assessment."""
         Returns:
             Formatted quality report.
         """
-        report = f"""# Quality Assurance Report
-
-## Overall Score: {quality_score}/100
-
-### Grammar & Spelling
-Score: {grammar_check.get('score', 0)}/100
-Issues Found: {grammar_check.get('issues_found', 0)}
-{grammar_check.get('feedback', '')[:200]}...
-
-### Factual Accuracy
-Score: {fact_check.get('score', 0)}/100
-Issues Found: {fact_check.get('issues_found', 0)}
-{fact_check.get('feedback', '')[:200]}...
-
-### Style & Tone
-Score: {style_check.get('score', 0)}/100
-{style_check.get('feedback', '')[:200]}...
-
-### SEO Validation
-Score: {seo_validation.get('score', 0)}/100
-Issues: {len(seo_validation.get('issues', []))}
-"""
-
-        return report
+        report = io.StringIO()
+        report.write(f"# Quality Assurance Report\n\n## Overall Score: {quality_score}/100\n")
+        for title, check, counts_issues in (
+            ("Grammar & Spelling", grammar_check, True),
+            ("Factual Accuracy", fact_check, True),
+            ("Style & Tone", style_check, False),
+        ):
+            report.write(f"\n### {title}\nScore: {check.get('score', 0)}/100\n")
+            if counts_issues:
+                report.write(f"Issues Found: {check.get('issues_found', 0)}\n")
+            # Only the start of the feedback goes in the report
+            report.write(f"{check.get('feedback', '')[:_REPORT_FEEDBACK_CHARS]}...\n")
+        report.write(
+            f"\n### SEO Validation\nScore: {seo_validation.get('score', 0)}/100\n"
+            f"Issues: {len(seo_validation.get('issues', []))}\n"
+        )
+        return report.getvalue()
 
     def _generate_recommendations(
         self,
@@ -0,0 +1,52 @@
+"""Concurrency and request-rate limiting for LLM calls."""
+
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterator
+
+
+class RateLimiter:
+    """Caps in-flight LLM requests and paces them with a token bucket.
+
+    A semaphore bounds how many requests run at once; the bucket refills
+    at the configured requests-per-minute rate and allows bursts of up to
+    max_concurrency requests.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: float = 0):
+        """Initialize the limiter.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight.
+            requests_per_minute: Sustained request rate; 0 disables pacing.
+        """
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._rate = requests_per_minute / 60.0
+        self._capacity = float(max(1, max_concurrency))
+        self._tokens = self._capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    @contextlib.asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        """Hold a request slot for the duration of the block."""
+        async with self._semaphore:
+            await self._take_token()
+            yield
+
+    async def _take_token(self) -> None:
+        """Wait until the bucket has a token, then take it."""
+        if self._rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
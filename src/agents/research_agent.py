@@ -1,18 +1,61 @@
 """Research agent for gathering and summarizing information."""
 
 import asyncio
-from datetime import datetime
+import itertools
+import re
 from typing import Any, Dict, List
 import logging
 
-from src.agents.base_agent import BaseAgent
+from src.agents.base_agent import BaseAgent, now_iso
 
 logger = logging.getLogger(__name__)
 
+# Bulleted or numbered summary lines, without surrounding whitespace
+_KEY_POINT_RE = re.compile(r"^[^\S\n]*([-*\d][^\n]*?)[^\S\n]*$", re.MULTILINE)
+
+# Prompt templates, built once at import
+_SOURCES_PROMPT = """Generate a list of credible research sources about the topic below.
+
+For each source, provide:
+- Title
+- URL (use example.com format)
+- Brief description
+- Relevance score (0.0 to 1.0)
+
+Format as JSON array.
+
+"""
+_REPORT_PROMPT = """Create a comprehensive research report on the topic below.
+
+Based on the sources gathered, synthesize the information into:
+1. Executive Summary
+2. Key Findings
+3. Important Statistics
+4. Trends and Patterns
+5. Gaps in Current Research
+6. Recommendations
+
+Format as well-structured markdown document.
+
+"""
+
+# Closing instructions shared by every source summary prompt
+_SUMMARY_INSTRUCTIONS = """Provide:
+1. Key findings (3-5 bullet points)
+2. Important statistics or data points
+3. Authoritative claims
+4. Any contradictions or limitations
+
+Format as structured summary."""
+
 
 class ResearchAgent(BaseAgent):
     """Research-focused agent for information gathering."""
 
+    # Upper bound on concurrent summarization calls, to stay under the
+    # provider's rate limits
+    max_llm_concurrency: int = 8
+
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute research task.
 
@@ -32,12 +75,11 @@ class ResearchAgent(BaseAgent):
             # Gather sources
             sources = await self._gather_sources(topic, max_sources)
 
-            # Summarize sources
-            summaries = await self._summarize_sources(sources, topic)
-
-            # Create research report
-            research_report = await self._create_research_report(
-                topic, sources, summaries
+            # The report prompt only needs the topic and source count, so it
+            # is written while the sources are being summarized
+            summaries, research_report = await asyncio.gather(
+                self._summarize_sources(sources, topic),
+                self._create_research_report(topic, sources),
             )
 
             result = {
@@ -49,11 +91,10 @@ class ResearchAgent(BaseAgent):
                 "sources": sources,
                 "summaries": summaries,
                 "research_report": research_report,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
             }
 
-            self.update_session(task_id, "completed")
-            self.save_task_result(task_id, result)
+            await self.record_task_outcome(task_id, "completed", result)
 
             self.logger.info(
                 f"Research completed: {len(sources)} sources found"
@@ -62,7 +103,7 @@ class ResearchAgent(BaseAgent):
 
         except Exception as e:
             self.logger.error(f"Research task failed: {str(e)}")
-            self.update_session(task_id, "failed")
+            await self.record_task_outcome(task_id, "failed")
             raise
 
     async def _gather_sources(
@@ -79,27 +120,23 @@ class ResearchAgent(BaseAgent):
         """
         # Simulate research with structured data
         # In production, this would call actual search APIs
-        prompt = f"""Generate a list of {limit} credible research sources about: {topic}
+        prompt = f"{_SOURCES_PROMPT}Number of sources: {limit}\nTopic: {topic}"
 
-For each source, provide:
-- Title
-- URL (use example.com format)
-- Brief description
-- Relevance score (0.0 to 1.0)
-
-Format as JSON array."""
+        slug = topic.replace(" ", "-")
 
         try:
             response = await self.call_llm(prompt, max_tokens=2048)
             # Parse response and extract sources
             # For demo, we'll create structured sources
+            url_prefix = f"https://example.com/research/{slug.lower()}"
+            description = f"Comprehensive information about {topic} covering key aspects and recent developments."
             sources = []
             for i in range(min(limit, 5)):
                 sources.append(
                     {
                         "title": f"Research Source {i+1} on {topic}",
-                        "url": f"https://example.com/research/{topic.replace(' ', '-').lower()}-{i+1}",
-                        "description": f"Comprehensive information about {topic} covering key aspects and recent developments.",
+                        "url": f"{url_prefix}-{i+1}",
+                        "description": description,
                         "relevance": 0.9 - (i * 0.1),
                         "type": "article",
                     }
@@ -111,7 +148,7 @@ Format as JSON array."""
             return [
                 {
                     "title": f"Primary Source on {topic}",
-                    "url": f"https://example.com/{topic.replace(' ', '-')}",
+                    "url": f"https://example.com/{slug}",
                     "description": f"Authoritative source on {topic}",
                     "relevance": 0.95,
                     "type": "article",
@@ -130,46 +167,41 @@ Format as JSON array."""
         Returns:
             List of summary dictionaries with key points.
         """
-        summaries = []
-
-        for source in sources:
-            prompt = f"""Summarize the following research source about {topic}:
-
-Title: {source['title']}
-URL: {source['url']}
-Description: {source.get('description', '')}
-
-Provide:
-1. Key findings (3-5 bullet points)
-2. Important statistics or data points
-3. Authoritative claims
-4. Any contradictions or limitations
-
-Format as structured summary."""
+        semaphore = asyncio.Semaphore(self.max_llm_concurrency)
+        # Only the source fields differ between prompts
+        header = f"Summarize the following research source about {topic}:\n\n"
+
+        async def summarize(source: Dict[str, Any]) -> Dict[str, Any]:
+            prompt = (
+                f"{header}Title: {source['title']}\n"
+                f"URL: {source['url']}\n"
+                f"Description: {source.get('description', '')}\n\n"
+                f"{_SUMMARY_INSTRUCTIONS}"
+            )
 
             try:
-                summary_text = await self.call_llm(prompt, max_tokens=1024)
-                summary = {
+                async with semaphore:
+                    summary_text = await self.call_llm(prompt, max_tokens=1024)
+                return {
                     "source_url": source["url"],
                     "source_title": source["title"],
                     "summary": summary_text,
                     "key_points": self._extract_key_points(summary_text),
                     "relevance_score": source.get("relevance", 0.5),
                 }
-                summaries.append(summary)
             except Exception as e:
                 self.logger.warning(f"Failed to summarize {source['url']}: {e}")
-                summaries.append(
-                    {
-                        "source_url": source["url"],
-                        "source_title": source["title"],
-                        "summary": f"Summary of {source['title']}",
-                        "key_points": ["Point 1", "Point 2", "Point 3"],
-                        "relevance_score": source.get("relevance", 0.5),
-                    }
-                )
+                return {
+                    "source_url": source["url"],
+                    "source_title": source["title"],
+                    "summary": f"Summary of {source['title']}",
+                    "key_points": ["Point 1", "Point 2", "Point 3"],
+                    "relevance_score": source.get("relevance", 0.5),
+                }
 
-        return summaries
+        # Summaries come back in source order
+        summaries = await asyncio.gather(*(summarize(s) for s in sources))
+        return list(summaries)
 
     def _extract_key_points(self, summary_text: str) -> List[str]:
         """Extract key points from summary text.
@@ -181,45 +213,27 @@ Format as structured summary."""
             List of key point strings.
         """
         # Simple extraction - in production would use more sophisticated parsing
-        lines = summary_text.split("\n")
-        key_points = []
-        for line in lines:
-            line = line.strip()
-            if line and (
-                line.startswith("-") or line.startswith("*") or line[0].isdigit()
-            ):
-                key_points.append(line)
-            if len(key_points) >= 5:
-                break
-        return key_points[:5] if key_points else ["Key finding 1", "Key finding 2"]
+        key_points = [
+            match.group(1)
+            for match in itertools.islice(_KEY_POINT_RE.finditer(summary_text), 5)
+        ]
+        return key_points or ["Key finding 1", "Key finding 2"]
 
     async def _create_research_report(
         self,
         topic: str,
         sources: List[Dict[str, Any]],
-        summaries: List[Dict[str, Any]],
     ) -> str:
         """Create comprehensive research report.
 
         Args:
             topic: Research topic.
             sources: List of gathered sources.
-            summaries: List of source summaries.
 
         Returns:
             Formatted research report as markdown.
         """
-        prompt = f"""Create a comprehensive research report on: {topic}
-
-Based on {len(sources)} sources gathered, synthesize the information into:
-1. Executive Summary
-2. Key Findings
-3. Important Statistics
-4. Trends and Patterns
-5. Gaps in Current Research
-6. Recommendations
-
-Format as well-structured markdown document."""
+        prompt = f"{_REPORT_PROMPT}Topic: {topic}\nSources gathered: {len(sources)}"
 
         try:
             report = await self.call_llm(prompt, max_tokens=2048)
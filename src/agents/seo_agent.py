@@ -1,14 +1,100 @@
 """SEO agent for content optimization."""
 
+import asyncio
 import re
-from datetime import datetime
-from typing import Any, Dict, List
+from collections import Counter
+from typing import Any, Dict, List, Tuple
 import logging
 
-from src.agents.base_agent import BaseAgent
+from src.agents.base_agent import BaseAgent, now_iso
 
 logger = logging.getLogger(__name__)
 
+# Keyword analyses and metadata are generated deterministically so repeat
+# runs are served from the LLM cache; keyword trends go stale sooner
+_KEYWORD_CACHE_TTL = 24 * 3600
+_METADATA_CACHE_TTL = 7 * 24 * 3600
+
+# Preamble and article block shared by the combined analysis and its
+# per-step fallbacks; only the trailing task differs
+_SEO_PREFIX = "You are an SEO specialist reviewing the article below.\n\n"
+# Keyword analysis and metadata requested together in one tool call
+_ANALYSIS_TASK = """Analyze the content for SEO and create optimized metadata.
+
+Identify secondary keywords (3-5 related terms) and summarize the keyword
+analysis, including long-tail and LSI (Latent Semantic Indexing) terms.
+Write a meta title (50-60 characters, include the primary keyword), a
+meta description (150-160 characters, compelling and keyword-rich), an
+Open Graph title and an Open Graph description.
+
+Call submit_seo_analysis with the results."""
+_KEYWORDS_TASK = """Identify SEO keywords in the content:
+1. Primary keyword (main topic)
+2. Secondary keywords (3-5 related terms)
+3. Long-tail keywords (2-3 phrases)
+4. Keyword density for each
+5. LSI (Latent Semantic Indexing) keywords
+
+Format as structured analysis."""
+_METADATA_TASK = """Create optimized SEO metadata for the content:
+1. Meta Title (50-60 characters, include primary keyword)
+2. Meta Description (150-160 characters, compelling and keyword-rich)
+3. Open Graph Title
+4. Open Graph Description
+
+Format as structured metadata."""
+_SUBMIT_SEO_ANALYSIS_TOOL = {
+    "name": "submit_seo_analysis",
+    "description": "Submit the keyword analysis and SEO metadata.",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "secondary_keywords": {"type": "array", "items": {"type": "string"}},
+            "analysis": {"type": "string"},
+            "meta_title": {"type": "string"},
+            "meta_description": {"type": "string"},
+            "og_title": {"type": "string"},
+            "og_description": {"type": "string"},
+        },
+        "required": [
+            "secondary_keywords",
+            "meta_title",
+            "meta_description",
+            "og_title",
+            "og_description",
+        ],
+    },
+}
+
+# SEO score points indexed by title length, description length and
+# heading count; the last entry covers every larger value
+_TITLE_POINTS = bytes(20 if 50 <= n <= 60 else 10 if n else 0 for n in range(62))
+_DESCRIPTION_POINTS = bytes(
+    20 if 150 <= n <= 160 else 10 if n else 0 for n in range(162)
+)
+_HEADING_POINTS = bytes(20 if 3 <= n <= 10 else 10 if n else 0 for n in range(12))
+
+# Characters of content shown to the LLM, and of the schema article body
+_PROMPT_EXCERPT_CHARS = 1500
+_SCHEMA_BODY_CHARS = 500
+
+# Whitespace, markdown headings, and quoted terms in keyword analyses
+_WHITESPACE_RE = re.compile(r"\s")
+_HEADING_RE = re.compile(r"^#+\s", re.MULTILINE)
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+# Numbered or dashed list items, up to any "term: explanation" colon
+_LIST_ITEM_RE = re.compile(r"^[-0-9][^:\n]*", re.MULTILINE)
+
+
+def _seo_prompt(topic: str, excerpt: str, task: str) -> str:
+    """Build an SEO prompt from the shared article block and a task."""
+    return (
+        f"{_SEO_PREFIX}Topic: {topic}\n"
+        f"Primary Keyword: {topic.lower()}\n"
+        f"Content: {excerpt}...\n\n"
+        f"{task}"
+    )
+
 
 class SEOAgent(BaseAgent):
     """SEO specialist agent for optimizing content."""
@@ -16,6 +102,10 @@ class SEOAgent(BaseAgent):
     async def execute_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
         """Execute SEO optimization task.
 
+        Setting ``use_llm`` to False in the task skips every LLM call and
+        fills keywords and metadata from templates, for tests and bulk runs
+        where deterministic output is enough.
+
         Args:
             task: Task dictionary containing content to optimize.
 
@@ -25,25 +115,67 @@ class SEOAgent(BaseAgent):
         content = task.get("content", "")
         topic = task.get("topic", "")
         task_id = task.get("id", "unknown")
+        use_llm = task.get("use_llm", True)
 
         self.logger.info(f"Starting SEO optimization for topic: {topic}")
 
         try:
-            # Analyze keywords
-            keywords = await self._analyze_keywords(content, topic)
-
-            # Optimize metadata
-            metadata = await self._optimize_metadata(content, topic, keywords)
+            # Tokenize the original content once for keyword density and
+            # the word counts
+            token_counts = Counter(content.lower().split())
+            content_words = sum(token_counts.values())
+            # Every prompt shows the same excerpt; the schema body is its head
+            excerpt = content[:_PROMPT_EXCERPT_CHARS]
+
+            # Analyze keywords and write metadata; every later stage
+            # depends on them
+            if not use_llm:
+                keywords = self._template_keywords(
+                    topic,
+                    self._calculate_keyword_density(
+                        token_counts, content_words, topic
+                    ),
+                )
+                metadata = self._template_metadata(topic)
+            else:
+                try:
+                    keywords, metadata = await self._analyze_keywords_and_metadata(
+                        excerpt, topic, token_counts, content_words
+                    )
+                except Exception as e:
+                    self.logger.warning(
+                        f"Combined SEO analysis failed, running steps separately: {e}"
+                    )
+                    keywords = await self._analyze_keywords(
+                        excerpt, topic, token_counts, content_words
+                    )
+                    metadata = await self._optimize_metadata(excerpt, topic, keywords)
 
             # Improve content SEO
             optimized_content = await self._optimize_content(content, keywords)
 
-            # Generate schema markup
-            schema = await self._generate_schema(content, topic, metadata)
+            # Structure of the optimized content, shared by the score and
+            # the recommendations. Content opening with a heading comes back
+            # unchanged, and its words were already counted with the tokens
+            if optimized_content is content:
+                word_count = content_words
+            else:
+                word_count = len(optimized_content.split())
+            heading_count = len(_HEADING_RE.findall(optimized_content))
+
+            # Generate schema markup and recommendations
+            schema, recommendations = await asyncio.gather(
+                self._generate_schema(
+                    excerpt[:_SCHEMA_BODY_CHARS], topic, metadata, content_words
+                ),
+                self._generate_seo_recommendations(
+                    keywords, word_count, heading_count
+                ),
+            )
 
             # Calculate SEO score
             seo_score = self._calculate_seo_score(
-                optimized_content, keywords, metadata
+                keywords, metadata, word_count, heading_count
             )
 
             result = {
@@ -55,72 +187,133 @@ class SEOAgent(BaseAgent):
                 "optimized_content": optimized_content,
                 "schema_markup": schema,
                 "seo_score": seo_score,
-                "recommendations": await self._generate_seo_recommendations(
-                    optimized_content, keywords
-                ),
-                "timestamp": datetime.now().isoformat(),
+                "recommendations": recommendations,
+                "skipped_llm": not use_llm,
+                "timestamp": now_iso(),
             }
 
-            self.update_session(task_id, "completed")
-            self.save_task_result(task_id, result)
+            await self.record_task_outcome(task_id, "completed", result)
 
             self.logger.info(f"SEO optimization completed: Score {seo_score}/100")
             return result
 
         except Exception as e:
             self.logger.error(f"SEO task failed: {str(e)}")
-            self.update_session(task_id, "failed")
+            await self.record_task_outcome(task_id, "failed")
             raise
 
+    async def _analyze_keywords_and_metadata(
+        self,
+        excerpt: str,
+        topic: str,
+        token_counts: Counter,
+        word_count: int,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Analyze keywords and write metadata in one LLM call.
+
+        The primary keyword is the topic itself, so the metadata prompt does
+        not need the keyword analysis and both can share one request.
+
+        Args:
+            excerpt: Leading part of the content shown to the LLM.
+            topic: Main topic.
+            token_counts: Occurrences of each lowercased word in the content.
+            word_count: Number of words in the content.
+
+        Returns:
+            Keyword analysis and metadata dictionaries, shaped like the
+            results of _analyze_keywords() and _optimize_metadata().
+        """
+        primary = topic.lower()
+        analysis = await self.call_llm_tool(
+            _seo_prompt(topic, excerpt, _ANALYSIS_TASK),
+            _SUBMIT_SEO_ANALYSIS_TOOL,
+            max_tokens=1024,
+            temperature=0,
+            # Holds the keyword analysis, so it expires with keyword trends
+            cache_ttl=_KEYWORD_CACHE_TTL,
+        )
+        secondary = [
+            keyword.lower() for keyword in analysis["secondary_keywords"] if keyword
+        ][:5]
+        keywords = {
+            "primary": primary,
+            "secondary": secondary or ["keyword1", "keyword2", "keyword3"],
+            "long_tail": self._extract_long_tail_keywords(excerpt, topic),
+            "density": self._calculate_keyword_density(
+                token_counts, word_count, primary
+            ),
+            "analysis": analysis.get("analysis", ""),
+        }
+        metadata = {
+            "title": analysis["meta_title"][:60],
+            "description": analysis["meta_description"][:160],
+            "og_title": analysis["og_title"][:60],
+            "og_description": analysis["og_description"][:160],
+        }
+        return keywords, metadata
+
     async def _analyze_keywords(
-        self, content: str, topic: str
+        self,
+        excerpt: str,
+        topic: str,
+        token_counts: Counter,
+        word_count: int,
     ) -> Dict[str, Any]:
         """Analyze and extract keywords from content.
 
         Args:
-            content: Content to analyze.
+            excerpt: Leading part of the content shown to the LLM.
             topic: Main topic.
+            token_counts: Occurrences of each lowercased word in the content.
+            word_count: Number of words in the content.
 
         Returns:
             Dictionary with keyword analysis.
         """
-        prompt = f"""Analyze the following content and identify SEO keywords:
-
-Topic: {topic}
-Content: {content[:1500]}...
-
-Identify:
-1. Primary keyword (main topic)
-2. Secondary keywords (3-5 related terms)
-3. Long-tail keywords (2-3 phrases)
-4. Keyword density for each
-5. LSI (Latent Semantic Indexing) keywords
-
-Format as structured analysis."""
-
         try:
-            analysis = await self.call_llm(prompt, max_tokens=1024)
+            analysis = await self.call_llm(
+                _seo_prompt(topic, excerpt, _KEYWORDS_TASK),
+                max_tokens=1024,
+                temperature=0,
+                cache_ttl=_KEYWORD_CACHE_TTL,
+            )
             # Extract keywords from analysis
             primary = topic.lower()
             secondary = self._extract_keywords_from_text(analysis, 5)
-            long_tail = self._extract_long_tail_keywords(content, topic)
+            long_tail = self._extract_long_tail_keywords(excerpt, topic)
 
             return {
                 "primary": primary,
                 "secondary": secondary,
                 "long_tail": long_tail,
-                "density": self._calculate_keyword_density(content, primary),
+                "density": self._calculate_keyword_density(
+                    token_counts, word_count, primary
+                ),
                 "analysis": analysis,
             }
         except Exception as e:
             self.logger.warning(f"Keyword analysis had issues: {e}")
-            return {
-                "primary": topic.lower(),
-                "secondary": [topic.lower() + " guide", topic.lower() + " tips"],
-                "long_tail": [f"best {topic.lower()}", f"how to {topic.lower()}"],
-                "density": 2.5,
-                "analysis": "Keyword analysis completed",
-            }
+            return self._template_keywords(topic)
+
+    def _template_keywords(self, topic: str, density: float = 2.5) -> Dict[str, Any]:
+        """Build a keyword analysis from the topic alone.
+
+        Args:
+            topic: Main topic.
+            density: Keyword density to report.
+
+        Returns:
+            Dictionary shaped like the result of _analyze_keywords().
+        """
+        primary = topic.lower()
+        return {
+            "primary": primary,
+            "secondary": [primary + " guide", primary + " tips"],
+            "long_tail": [f"best {primary}", f"how to {primary}"],
+            "density": density,
+            "analysis": "Keyword analysis completed",
+        }
 
     def _extract_keywords_from_text(self, text: str, limit: int) -> List[str]:
         """Extract keywords from text.
@@ -133,19 +326,15 @@ Format as structured analysis."""
             List of keyword strings.
         """
         # Simple extraction - look for quoted terms or listed items
-        keywords = []
-        words = re.findall(r'"([^"]+)"', text)
-        keywords.extend(words[:limit])
+        keywords = _QUOTED_RE.findall(text)[:limit]
 
         # Also look for numbered lists
-        lines = text.split("\n")
-        for line in lines:
-            if line.strip() and (line[0].isdigit() or line.startswith("-")):
-                keyword = line.split(":", 1)[0].lstrip("0123456789.- ")
-                if keyword and len(keyword) > 3:
-                    keywords.append(keyword.lower())
-                if len(keywords) >= limit:
-                    break
+        for match in _LIST_ITEM_RE.finditer(text):
+            if len(keywords) >= limit:
+                break
+            keyword = match.group().lstrip("0123456789.- ")
+            if len(keyword) > 3:
+                keywords.append(keyword.lower())
 
         return keywords[:limit] if keywords else ["keyword1", "keyword2", "keyword3"]
 
@@ -166,54 +355,50 @@ Format as structured analysis."""
             f"{topic_lower} best practices",
         ]
 
-    def _calculate_keyword_density(self, content: str, keyword: str) -> float:
+    def _calculate_keyword_density(
+        self, token_counts: Counter, word_count: int, keyword: str
+    ) -> float:
         """Calculate keyword density percentage.
 
+        A word counts as an occurrence when it contains the keyword.
+
         Args:
-            content: Content text.
+            token_counts: Occurrences of each lowercased word in the content.
+            word_count: Number of words in the content.
             keyword: Keyword to count.
 
         Returns:
             Keyword density as percentage.
         """
-        words = content.lower().split()
         keyword_lower = keyword.lower()
-        count = sum(1 for word in words if keyword_lower in word)
-        total_words = len(words)
-        return round((count / total_words * 100) if total_words > 0 else 0, 2)
+        if _WHITESPACE_RE.search(keyword_lower):
+            # Words never contain whitespace, so a phrase cannot match one
+            count = 0
+        else:
+            # Each distinct word is tested once, however often it appears
+            count = sum(n for word, n in token_counts.items() if keyword_lower in word)
+        return round((count / word_count * 100) if word_count > 0 else 0, 2)
 
     async def _optimize_metadata(
-        self, content: str, topic: str, keywords: Dict[str, Any]
+        self, excerpt: str, topic: str, keywords: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Optimize meta title and description.
 
         Args:
-            content: Content text.
+            excerpt: Leading part of the content shown to the LLM.
             topic: Main topic.
             keywords: Keyword analysis.
 
         Returns:
             Dictionary with optimized metadata.
         """
-        primary_keyword = keywords.get("primary", topic)
-        content_preview = content[:200].replace("\n", " ")
-
-        prompt = f"""Create optimized SEO metadata:
-
-Topic: {topic}
-Primary Keyword: {primary_keyword}
-Content Preview: {content_preview}...
-
-Generate:
-1. Meta Title (50-60 characters, include primary keyword)
-2. Meta Description (150-160 characters, compelling and keyword-rich)
-3. Open Graph Title
-4. Open Graph Description
-
-Format as structured metadata."""
-
         try:
-            metadata_text = await self.call_llm(prompt, max_tokens=512)
+            metadata_text = await self.call_llm(
+                _seo_prompt(topic, excerpt, _METADATA_TASK),
+                max_tokens=512,
+                temperature=0,
+                cache_ttl=_METADATA_CACHE_TTL,
+            )
             return {
                 "title": self._extract_meta_field(metadata_text, "Title", 60),
                 "description": self._extract_meta_field(
@@ -227,12 +412,23 @@ Format as structured metadata."""
             }
         except Exception as e:
             self.logger.warning(f"Metadata optimization had issues: {e}")
-            return {
-                "title": f"{topic} - Complete Guide",
-                "description": f"Learn everything about {topic} with this comprehensive guide.",
-                "og_title": f"{topic} Guide",
-                "og_description": f"Complete guide to {topic}",
-            }
+            return self._template_metadata(topic)
+
+    def _template_metadata(self, topic: str) -> Dict[str, Any]:
+        """Build metadata from the topic alone.
+
+        Args:
+            topic: Main topic.
+
+        Returns:
+            Dictionary shaped like the result of _optimize_metadata().
+        """
+        return {
+            "title": f"{topic} - Complete Guide",
+            "description": f"Learn everything about {topic} with this comprehensive guide.",
+            "og_title": f"{topic} Guide",
+            "og_description": f"Complete guide to {topic}",
+        }
 
     def _extract_meta_field(
         self, text: str, field_name: str, max_length: int
@@ -273,44 +469,32 @@ Format as structured metadata."""
             SEO-optimized content.
         """
         primary = keywords.get("primary", "")
-        secondary = keywords.get("secondary", [])
 
-        # Ensure primary keyword in first paragraph
-        lines = content.split("\n")
-        optimized_lines = []
+        # Ensure primary keyword in first paragraph; only the first line can
+        # change, and headings are left alone
+        first_line, newline, rest = content.partition("\n")
+        if not primary or primary in first_line.lower() or first_line.startswith("#"):
+            return content
 
-        for i, line in enumerate(lines):
-            if i == 0 and primary and primary not in line.lower():
-                # Add primary keyword to first heading or paragraph
-                if line.startswith("#"):
-                    optimized_lines.append(line)
-                else:
-                    optimized_lines.append(
-                        line.replace(
-                            line.split()[0] if line.split() else "",
-                            f"{primary.title()} {line.split()[0] if line.split() else ''}",
-                            1,
-                        )
-                    )
-            else:
-                optimized_lines.append(line)
-
-        return "\n".join(optimized_lines)
+        # Put the keyword in front of the first word, keeping indentation
+        text = first_line.lstrip()
+        indent = first_line[: len(first_line) - len(text)] if text else ""
+        return f"{indent}{primary.title()} {text or first_line}{newline}{rest}"
 
     async def _generate_schema(
-        self, content: str, topic: str, metadata: Dict[str, Any]
+        self, body: str, topic: str, metadata: Dict[str, Any], word_count: int
     ) -> Dict[str, Any]:
         """Generate JSON-LD schema markup.
 
         Args:
-            content: Content text.
+            body: Article body excerpt for the schema.
             topic: Main topic.
             metadata: Metadata dictionary.
+            word_count: Number of words in the content.
 
         Returns:
             Schema markup dictionary.
         """
-        word_count = len(content.split())
         reading_time = round(word_count / 200.0, 1)
 
         return {
@@ -318,7 +502,7 @@ Format as structured metadata."""
             "@type": "Article",
             "headline": metadata.get("title", topic),
             "description": metadata.get("description", ""),
-            "articleBody": content[:500],
+            "articleBody": body,
             "wordCount": word_count,
             "timeRequired": f"PT{int(reading_time)}M",
             "author": {
@@ -328,14 +512,19 @@ Format as structured metadata."""
         }
 
     def _calculate_seo_score(
-        self, content: str, keywords: Dict[str, Any], metadata: Dict[str, Any]
+        self,
+        keywords: Dict[str, Any],
+        metadata: Dict[str, Any],
+        word_count: int,
+        heading_count: int,
     ) -> int:
         """Calculate overall SEO score.
 
         Args:
-            content: Content text.
             keywords: Keyword analysis.
             metadata: Metadata dictionary.
+            word_count: Number of words in the content.
+            heading_count: Number of markdown headings in the content.
 
         Returns:
             SEO score out of 100.
@@ -343,18 +532,12 @@ Format as structured metadata."""
         score = 0
 
         # Title optimization (20 points)
-        title = metadata.get("title", "")
-        if title and 50 <= len(title) <= 60:
-            score += 20
-        elif title:
-            score += 10
+        title = metadata.get("title") or ""
+        score += _TITLE_POINTS[min(len(title), len(_TITLE_POINTS) - 1)]
 
         # Description optimization (20 points)
-        desc = metadata.get("description", "")
-        if desc and 150 <= len(desc) <= 160:
-            score += 20
-        elif desc:
-            score += 10
+        desc = metadata.get("description") or ""
+        score += _DESCRIPTION_POINTS[min(len(desc), len(_DESCRIPTION_POINTS) - 1)]
 
         # Keyword density (20 points)
         density = keywords.get("density", 0)
@@ -364,29 +547,25 @@ Format as structured metadata."""
             score += 10
 
         # Content length (20 points)
-        word_count = len(content.split())
         if 1000 <= word_count <= 3000:
             score += 20
         elif 500 <= word_count <= 5000:
             score += 10
 
         # Headings structure (20 points)
-        headings = len(re.findall(r"^#+\s", content, re.MULTILINE))
-        if 3 <= headings <= 10:
-            score += 20
-        elif headings > 0:
-            score += 10
+        score += _HEADING_POINTS[min(heading_count, len(_HEADING_POINTS) - 1)]
 
         return min(score, 100)
 
     async def _generate_seo_recommendations(
-        self, content: str, keywords: Dict[str, Any]
+        self, keywords: Dict[str, Any], word_count: int, heading_count: int
     ) -> List[str]:
         """Generate SEO improvement recommendations.
 
         Args:
-            content: Content text.
             keywords: Keyword analysis.
+            word_count: Number of words in the content.
+            heading_count: Number of markdown headings in the content.
 
         Returns:
             List of recommendation strings.
@@ -399,14 +578,12 @@ Format as structured metadata."""
         elif density > 3.0:
             recommendations.append("Reduce keyword density to avoid over-optimization")
 
-        word_count = len(content.split())
         if word_count < 1000:
             recommendations.append("Expand content to at least 1000 words")
         elif word_count > 3000:
             recommendations.append("Consider breaking into multiple articles")
 
-        headings = len(re.findall(r"^#+\s", content, re.MULTILINE))
-        if headings < 3:
+        if heading_count < 3:
             recommendations.append("Add more section headings for better structure")
 
         return recommendations
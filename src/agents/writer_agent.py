@@ -1,13 +1,76 @@
 """Writer agent for content generation."""
 
-from datetime import datetime
-from typing import Any, Dict
+import re
+from typing import Any, Dict, List
 import logging
 
-from src.agents.base_agent import BaseAgent
+from src.agents.base_agent import BaseAgent, now_iso
 
 logger = logging.getLogger(__name__)
 
+# Whitespace at the end of a line, and runs of two or more blank lines
+_TRAILING_WHITESPACE_RE = re.compile(r"[^\S\n]+$", re.MULTILINE)
+_BLANK_LINES_RE = re.compile(r"\n{3,}")
+# Guide phrasing the outline puts around the topic in its title
+_TITLE_GUIDE_RE = re.compile(r"(?:Comprehensive )?Guide to ")
+
+# Article request; filled with str.format() once per task
+_ARTICLE_PROMPT = """Write a comprehensive article about {subject} based on the following outline:
+
+Title: {title}
+
+Introduction:
+- Hook: {hook}
+- Thesis: {thesis}
+- Overview: {overview}
+
+Sections:
+{sections}
+
+Style Guide: {style}
+- Use clear, engaging prose
+- Maintain professional tone
+- Include relevant examples
+- Use proper markdown formatting
+- Ensure smooth transitions between sections
+- Focus specifically on {subject}
+
+Research Context: {research}
+
+Write the complete article in markdown format with proper headings, paragraphs, and formatting. Make sure the content is specifically about {subject} and not generic."""
+
+
+class _StreamFormatter:
+    """Incremental form of WriterAgent._format_content().
+
+    Fragments are split into lines as they arrive; each completed line has
+    its trailing whitespace removed and blank lines after another blank
+    line are dropped, so only the unfinished last line is held back.
+    """
+
+    def __init__(self):
+        self._lines: List[str] = []
+        self._partial = ""
+        self._prev_empty = False
+
+    def feed(self, fragment: str) -> None:
+        """Add a fragment of streamed text."""
+        *complete, self._partial = (self._partial + fragment).split("\n")
+        for line in complete:
+            self._add_line(line)
+
+    def finish(self) -> str:
+        """Return the formatted text once the stream has ended."""
+        self._add_line(self._partial)
+        self._partial = ""
+        return "\n".join(self._lines).strip()
+
+    def _add_line(self, line: str) -> None:
+        line = line.rstrip()
+        if line or not self._prev_empty:
+            self._lines.append(line)
+        self._prev_empty = not line
+
 
 class WriterAgent(BaseAgent):
     """Content writing agent for generating articles."""
@@ -27,16 +90,17 @@ class WriterAgent(BaseAgent):
         task_id = task.get("id", "unknown")
         
         # Extract topic from research data or outline
-        topic = research_data.get("topic", "") or outline.get("title", "").replace("Comprehensive Guide to ", "").replace("Guide to ", "")
+        topic = research_data.get("topic", "") or _TITLE_GUIDE_RE.sub(
+            "", outline.get("title", "")
+        )
 
         self.logger.info(f"Starting content writing with style: {style_guide}, topic: {topic}")
 
         try:
-            # Generate content from outline
-            content = await self._generate_content(outline, style_guide, research_data, topic)
-
-            # Format content
-            formatted_content = await self._format_content(content)
+            # Generate content from outline, formatted as it streams in
+            formatted_content = await self._generate_content(
+                outline, style_guide, research_data, topic
+            )
 
             # Calculate metrics
             word_count = len(formatted_content.split())
@@ -51,18 +115,17 @@ class WriterAgent(BaseAgent):
                 "reading_time_minutes": reading_time,
                 "style": style_guide,
                 "topic": topic,
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
             }
 
-            self.update_session(task_id, "completed")
-            self.save_task_result(task_id, result)
+            await self.record_task_outcome(task_id, "completed", result)
 
             self.logger.info(f"Content written: {word_count} words")
             return result
 
         except Exception as e:
             self.logger.error(f"Writing task failed: {str(e)}")
-            self.update_session(task_id, "failed")
+            await self.record_task_outcome(task_id, "failed")
             raise
 
     async def _generate_content(
@@ -81,7 +144,7 @@ class WriterAgent(BaseAgent):
             topic: Main topic of the article.
 
         Returns:
-            Generated content as markdown string.
+            Generated content as a formatted markdown string.
         """
         title = outline.get("title", f"Article about {topic}" if topic else "Article")
         if "Unknown" in title or not title.strip():
@@ -100,37 +163,46 @@ class WriterAgent(BaseAgent):
                     s.get("summary", "")[:200] for s in research_data["summaries"][:3]
                 ])
         
-        prompt = f"""Write a comprehensive article about {topic if topic else 'the topic'} based on the following outline:
-
-Title: {title}
-
-Introduction:
-- Hook: {introduction.get('hook', f'Exploring {topic}' if topic else 'Introduction')}
-- Thesis: {introduction.get('thesis', f'Key insights about {topic}' if topic else 'Main thesis')}
-- Overview: {introduction.get('overview', f'This article covers essential aspects of {topic}' if topic else 'Overview')}
-
-Sections:
-{self._format_sections_for_prompt(sections)}
-
-Style Guide: {style}
-- Use clear, engaging prose
-- Maintain professional tone
-- Include relevant examples
-- Use proper markdown formatting
-- Ensure smooth transitions between sections
-- Focus specifically on {topic if topic else 'the topic'}
-
-Research Context: {research_summary[:1000] if research_summary else 'Research data available'}
-
-Write the complete article in markdown format with proper headings, paragraphs, and formatting. Make sure the content is specifically about {topic if topic else 'the topic'} and not generic."""
+        prompt = _ARTICLE_PROMPT.format(
+            subject=topic or "the topic",
+            title=title,
+            hook=introduction.get(
+                "hook", f"Exploring {topic}" if topic else "Introduction"
+            ),
+            thesis=introduction.get(
+                "thesis", f"Key insights about {topic}" if topic else "Main thesis"
+            ),
+            overview=introduction.get(
+                "overview",
+                f"This article covers essential aspects of {topic}"
+                if topic
+                else "Overview",
+            ),
+            sections=self._format_sections_for_prompt(sections),
+            style=style,
+            research=research_summary[:1000] or "Research data available",
+        )
 
         try:
-            content = await self.call_llm(prompt, max_tokens=4096)
-            return content
+            # Format lines as they arrive instead of after the whole
+            # article has been generated
+            formatter = _StreamFormatter()
+            fragments = 0
+            stream = self.call_llm_stream(prompt, max_tokens=4096)
+            try:
+                async for fragment in stream:
+                    formatter.feed(fragment)
+                    fragments += 1
+                    if fragments % 100 == 0:
+                        self.logger.debug(f"Article: {fragments} fragments received")
+            finally:
+                # Release the request's limiter slot even if formatting fails
+                await stream.aclose()
+            return formatter.finish()
         except Exception as e:
             self.logger.error(f"Content generation failed: {e}")
             # Return fallback content
-            return self._generate_fallback_content(outline)
+            return await self._format_content(self._generate_fallback_content(outline))
 
     def _format_sections_for_prompt(self, sections: list) -> str:
         """Format sections for prompt.
@@ -184,22 +256,10 @@ Write the complete article in markdown format with proper headings, paragraphs,
         Returns:
             Formatted markdown content.
         """
-        # Ensure proper markdown formatting
-        lines = content.split("\n")
-        formatted_lines = []
-        prev_empty = False
-
-        for line in lines:
-            line = line.rstrip()
-            if not line:
-                if not prev_empty:
-                    formatted_lines.append("")
-                    prev_empty = True
-            else:
-                formatted_lines.append(line)
-                prev_empty = False
-
-        return "\n".join(formatted_lines).strip()
+        # Ensure proper markdown formatting: no trailing whitespace and at
+        # most one blank line between blocks
+        content = _TRAILING_WHITESPACE_RE.sub("", content)
+        return _BLANK_LINES_RE.sub("\n\n", content).strip()
 
     def _calculate_reading_time(self, word_count: int) -> float:
         """Calculate reading time in minutes.
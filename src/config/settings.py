@@ -2,24 +2,21 @@
 
 import os
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Tuple
 from pathlib import Path
-from dotenv import load_dotenv
 
-load_dotenv()
 
-
-@dataclass
+@dataclass(frozen=True)
 class ModelConfig:
     """Model configuration with fallbacks."""
 
     primary: str
-    fallbacks: List[str]
+    fallbacks: Tuple[str, ...]
     max_tokens: int = 4096
     temperature: float = 0.7
 
 
-@dataclass
+@dataclass(frozen=True)
 class AgentRole:
     """Individual agent configuration."""
 
@@ -27,29 +24,79 @@ class AgentRole:
     role_name: str
     model_config: ModelConfig
     system_prompt: str
-    tools: List[str]
+    tools: Tuple[str, ...]
     workspace_path: str
     heartbeat_interval: int  # seconds
 
 
 class EnvironmentConfig:
-    """Runtime environment settings."""
+    """Runtime environment settings.
+
+    Values are read from the process environment when this module is
+    imported. Entry points call load() to also apply the ``.env`` file.
+    """
 
     # API Keys
-    GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    GROQ_API_KEY: str
 
     # Logging
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVEL: str
 
     # Directories
-    WORKSPACE_DIR: str = os.getenv("WORKSPACE_DIR", "./workspace")
-    MEMORY_DIR: str = os.getenv("MEMORY_DIR", "./workspace/shared_memory")
-    TASK_QUEUE_DIR: str = os.getenv("TASK_QUEUE_DIR", "./workspace/task_queue")
+    WORKSPACE_DIR: str
+    MEMORY_DIR: str
+    TASK_QUEUE_DIR: str
 
     # Execution
     MAX_RETRIES: int = 3
     TIMEOUT_SECONDS: int = 60
-    MAX_ITERATIONS: int = 20
+
+    # Pipeline tasks run at once when their dependencies allow it
+    MAX_PARALLEL_TASKS: int
+
+    # Reuse whole phase results when a task's input matches an earlier run
+    ACTION_CACHE_ENABLED: bool
+
+    # Groq request limits shared by all agents; 0 requests/minute disables
+    # rate pacing and leaves only the concurrency cap
+    GROQ_MAX_CONCURRENCY: int
+    GROQ_REQUESTS_PER_MINUTE: float
+
+    # Lifetime of cached deterministic LLM responses; 0 never expires them
+    LLM_CACHE_TTL_SECONDS: float
+
+    _dotenv_loaded: bool = False
+
+    @classmethod
+    def load(cls, dotenv: bool = True) -> None:
+        """Read settings from environment variables.
+
+        Args:
+            dotenv: Whether to first load variables from the ``.env`` file.
+                The file is only read once per process.
+        """
+        if dotenv and not cls._dotenv_loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            cls._dotenv_loaded = True
+
+        cls.GROQ_API_KEY = os.getenv("GROQ_API_KEY", "")
+        cls.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+        cls.WORKSPACE_DIR = os.getenv("WORKSPACE_DIR", "./workspace")
+        cls.MEMORY_DIR = os.getenv("MEMORY_DIR", "./workspace/shared_memory")
+        cls.TASK_QUEUE_DIR = os.getenv("TASK_QUEUE_DIR", "./workspace/task_queue")
+        cls.ACTION_CACHE_ENABLED = (
+            os.getenv("ACTION_CACHE_ENABLED", "false").lower() == "true"
+        )
+        cls.MAX_PARALLEL_TASKS = int(os.getenv("MAX_PARALLEL_TASKS", "4"))
+        cls.GROQ_MAX_CONCURRENCY = int(os.getenv("GROQ_MAX_CONCURRENCY", "16"))
+        cls.GROQ_REQUESTS_PER_MINUTE = float(
+            os.getenv("GROQ_REQUESTS_PER_MINUTE", "0")
+        )
+        cls.LLM_CACHE_TTL_SECONDS = float(
+            os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600))
+        )
 
     @classmethod
     def ensure_directories(cls) -> None:
@@ -59,6 +106,59 @@ class EnvironmentConfig:
         Path(cls.TASK_QUEUE_DIR).mkdir(parents=True, exist_ok=True)
 
 
+EnvironmentConfig.load(dotenv=False)
+
+
+# System prompts
+_COORDINATOR_PROMPT = """You are the primary coordinator managing a content research and publishing pipeline.
+Your responsibilities:
+- Route research requests to appropriate agents
+- Validate work quality before publishing
+- Manage task dependencies and sequencing
+- Monitor agent status and memory usage
+- Make decisions about task routing and prioritization"""
+
+_RESEARCHER_PROMPT = """You are a research specialist gathering information from multiple sources.
+Your responsibilities:
+- Search and collect relevant sources on given topics
+- Summarize findings with proper citations
+- Identify gaps in information
+- Flag unreliable or contradictory sources
+- Organize research findings in structured format"""
+
+_ANALYST_PROMPT = """You are a data analyst synthesizing research findings.
+Your responsibilities:
+- Cross-reference sources for accuracy
+- Identify patterns and insights
+- Create structured outlines for content
+- Flag contradictions for human review
+- Generate key takeaways and recommendations"""
+
+_WRITER_PROMPT = """You are a professional content writer creating engaging, well-structured articles.
+Your responsibilities:
+- Write clear, compelling prose based on research and outlines
+- Follow brand voice guidelines
+- Structure content with proper headers and formatting
+- Ensure readability and flow
+- Maintain consistency in tone and style"""
+
+_SEO_SPECIALIST_PROMPT = """You are an SEO specialist optimizing content for search visibility.
+Your responsibilities:
+- Identify primary and secondary keywords
+- Optimize meta descriptions and titles
+- Improve readability scores
+- Generate structured data markup
+- Ensure keyword density is appropriate"""
+
+_QUALITY_CHECKER_PROMPT = """You are a quality assurance specialist reviewing content before publication.
+Your responsibilities:
+- Check for grammar and spelling errors
+- Verify factual accuracy
+- Ensure content meets quality standards
+- Validate SEO optimization
+- Provide improvement recommendations"""
+
+
 # Agent Configurations
 AGENT_CONFIGURATIONS: Dict[str, AgentRole] = {
     "coordinator": AgentRole(
@@ -66,18 +166,12 @@ AGENT_CONFIGURATIONS: Dict[str, AgentRole] = {
         role_name="Primary Coordinator",
         model_config=ModelConfig(
             primary="llama-3.3-70b-versatile",
-            fallbacks=["llama-3.1-8b-instant"],
+            fallbacks=("llama-3.1-8b-instant",),
             max_tokens=8192,
             temperature=0.5,
         ),
-        system_prompt="""You are the primary coordinator managing a content research and publishing pipeline.
-Your responsibilities:
-- Route research requests to appropriate agents
-- Validate work quality before publishing
-- Manage task dependencies and sequencing
-- Monitor agent status and memory usage
-- Make decisions about task routing and prioritization""",
-        tools=["task_dispatcher", "memory_reader", "quality_checker"],
+        system_prompt=_COORDINATOR_PROMPT,
+        tools=("task_dispatcher", "memory_reader", "quality_checker"),
         workspace_path="./workspace/coordinator",
         heartbeat_interval=300,
     ),
@@ -86,18 +180,12 @@ Your responsibilities:
         role_name="Research Specialist",
         model_config=ModelConfig(
             primary="llama-3.1-8b-instant",
-            fallbacks=["llama-3.3-70b-versatile"],
+            fallbacks=("llama-3.3-70b-versatile",),
             max_tokens=4096,
             temperature=0.3,
         ),
-        system_prompt="""You are a research specialist gathering information from multiple sources.
-Your responsibilities:
-- Search and collect relevant sources on given topics
-- Summarize findings with proper citations
-- Identify gaps in information
-- Flag unreliable or contradictory sources
-- Organize research findings in structured format""",
-        tools=["web_search", "source_aggregator", "citation_formatter"],
+        system_prompt=_RESEARCHER_PROMPT,
+        tools=("web_search", "source_aggregator", "citation_formatter"),
         workspace_path="./workspace/researcher",
         heartbeat_interval=600,
     ),
@@ -106,18 +194,12 @@ Your responsibilities:
         role_name="Data Analyst",
         model_config=ModelConfig(
             primary="llama-3.3-70b-versatile",
-            fallbacks=["llama-3.1-8b-instant"],
+            fallbacks=("llama-3.1-8b-instant",),
             max_tokens=4096,
             temperature=0.4,
         ),
-        system_prompt="""You are a data analyst synthesizing research findings.
-Your responsibilities:
-- Cross-reference sources for accuracy
-- Identify patterns and insights
-- Create structured outlines for content
-- Flag contradictions for human review
-- Generate key takeaways and recommendations""",
-        tools=["fact_checker", "outline_builder", "insight_extractor"],
+        system_prompt=_ANALYST_PROMPT,
+        tools=("fact_checker", "outline_builder", "insight_extractor"),
         workspace_path="./workspace/analyst",
         heartbeat_interval=600,
     ),
@@ -126,18 +208,12 @@ Your responsibilities:
         role_name="Content Writer",
         model_config=ModelConfig(
             primary="llama-3.3-70b-versatile",
-            fallbacks=["llama-3.1-8b-instant"],
+            fallbacks=("llama-3.1-8b-instant",),
             max_tokens=4096,
             temperature=0.7,
         ),
-        system_prompt="""You are a professional content writer creating engaging, well-structured articles.
-Your responsibilities:
-- Write clear, compelling prose based on research and outlines
-- Follow brand voice guidelines
-- Structure content with proper headers and formatting
-- Ensure readability and flow
-- Maintain consistency in tone and style""",
-        tools=["content_formatter", "style_checker", "header_generator"],
+        system_prompt=_WRITER_PROMPT,
+        tools=("content_formatter", "style_checker", "header_generator"),
         workspace_path="./workspace/writer",
         heartbeat_interval=900,
     ),
@@ -146,18 +222,12 @@ Your responsibilities:
         role_name="SEO Specialist",
         model_config=ModelConfig(
             primary="llama-3.1-8b-instant",
-            fallbacks=["llama-3.3-70b-versatile"],
+            fallbacks=("llama-3.3-70b-versatile",),
             max_tokens=2048,
             temperature=0.3,
         ),
-        system_prompt="""You are an SEO specialist optimizing content for search visibility.
-Your responsibilities:
-- Identify primary and secondary keywords
-- Optimize meta descriptions and titles
-- Improve readability scores
-- Generate structured data markup
-- Ensure keyword density is appropriate""",
-        tools=["keyword_analyzer", "metadata_optimizer", "schema_generator"],
+        system_prompt=_SEO_SPECIALIST_PROMPT,
+        tools=("keyword_analyzer", "metadata_optimizer", "schema_generator"),
         workspace_path="./workspace/seo",
         heartbeat_interval=900,
     ),
@@ -166,18 +236,12 @@ Your responsibilities:
         role_name="Quality Assurance",
         model_config=ModelConfig(
             primary="llama-3.3-70b-versatile",
-            fallbacks=["llama-3.1-8b-instant"],
+            fallbacks=("llama-3.1-8b-instant",),
             max_tokens=2048,
             temperature=0.2,
         ),
-        system_prompt="""You are a quality assurance specialist reviewing content before publication.
-Your responsibilities:
-- Check for grammar and spelling errors
-- Verify factual accuracy
-- Ensure content meets quality standards
-- Validate SEO optimization
-- Provide improvement recommendations""",
-        tools=["grammar_checker", "fact_validator", "quality_scorer"],
+        system_prompt=_QUALITY_CHECKER_PROMPT,
+        tools=("grammar_checker", "fact_validator", "quality_scorer"),
         workspace_path="./workspace/quality",
         heartbeat_interval=900,
     ),
@@ -1,16 +1,77 @@
 """Task management and inter-agent coordination."""
 
-import json
-import uuid
-from dataclasses import dataclass, asdict
+import contextlib
+import copy
+import os
+import secrets
+import sys
+import threading
+import time
+import weakref
+from collections import defaultdict
+from dataclasses import dataclass, replace
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Task updates are appended to tasks.log and folded back into tasks.json
+# once the log outgrows this size and tasks.json itself
+_LOG_COMPACT_MIN_BYTES = 1 << 20
+
+# Pretty-printed output that, like the stdlib encoder, accepts non-str keys
+_JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+
+# Tasks drop the per-instance __dict__ where dataclasses support slots
+# (Python 3.10+); older interpreters keep regular attributes
+_DATACLASS_SLOTS: Dict[str, Any] = (
+    {"slots": True} if sys.version_info >= (3, 10) else {}
+)
+
+# (epoch millisecond, formatted timestamp) of the last _now_iso() call
+_now_iso_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """Return the current local time as an ISO 8601 string.
+
+    The string is cached for the current millisecond, so tasks created or
+    updated together (such as a pipeline's five tasks) format it once.
+
+    Returns:
+        Timestamp such as "2025-01-31T12:00:05.123456".
+    """
+    global _now_iso_cache
+    now = time.time()
+    millisecond = int(now * 1000)
+    cached_millisecond, cached = _now_iso_cache
+    if millisecond != cached_millisecond:
+        cached = datetime.fromtimestamp(now).isoformat()
+        _now_iso_cache = (millisecond, cached)
+    return cached
+
+
+def _atomic_write(path: Path, chunks: Iterable[bytes]) -> None:
+    """Write a file through a temporary file swapped into place.
+
+    Readers see either the old or the new contents, never a partial
+    write, even if the process dies mid-way.
+
+    Args:
+        path: File to write.
+        chunks: File contents, written in order.
+    """
+    tmp_file = path.with_name(path.name + ".tmp")
+    with open(tmp_file, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_file, path)
+
 
 class TaskStatus(Enum):
     """Task lifecycle states."""
@@ -32,7 +93,7 @@ class TaskPriority(Enum):
     CRITICAL = 0
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class Task:
     """Task definition with dependencies."""
 
@@ -50,18 +111,183 @@ class Task:
     result: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
-        """Convert task to dictionary."""
-        data = asdict(self)
-        data["status"] = self.status.value
-        data["priority"] = self.priority.value
-        return data
+        """Convert task to dictionary.
+
+        Values are not copied, so the dictionary is meant for serializing
+        right away rather than for keeping.
+        """
+        return {
+            "id": self.id,
+            "title": self.title,
+            "assigned_agent": self.assigned_agent,
+            "status": self.status.value,
+            "priority": self.priority.value,
+            "dependencies": self.dependencies,
+            "payload": self.payload,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            "assigned_at": self.assigned_at,
+            "completed_at": self.completed_at,
+            "result": self.result,
+        }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "Task":
         """Create task from dictionary."""
-        data["status"] = TaskStatus(data["status"])
-        data["priority"] = TaskPriority(data["priority"])
-        return cls(**data)
+        return cls(
+            id=data["id"],
+            title=data["title"],
+            # A handful of agent IDs repeat across every task
+            assigned_agent=sys.intern(data["assigned_agent"]),
+            status=TaskStatus(data["status"]),
+            priority=TaskPriority(data["priority"]),
+            dependencies=data["dependencies"],
+            payload=data["payload"],
+            created_at=data["created_at"],
+            updated_at=data["updated_at"],
+            assigned_at=data.get("assigned_at"),
+            completed_at=data.get("completed_at"),
+            result=data.get("result"),
+        )
+
+    def copy(self) -> "Task":
+        """Return a copy that shares no mutable state with this task."""
+        return replace(
+            self,
+            dependencies=list(self.dependencies),
+            payload=copy.deepcopy(self.payload),
+            result=copy.deepcopy(self.result),
+        )
+
+
+class _ReadyIndex:
+    """Pending tasks whose dependencies have all completed, by agent.
+
+    Each task tracks how many of its dependencies are not completed yet,
+    and each task ID maps to the tasks waiting on it. A status change only
+    adjusts the counts of the tasks waiting on the changed one, so finding
+    an agent's ready tasks never scans the whole queue. Dependencies and
+    assigned agents are taken to be fixed once a task is created.
+
+    Among tasks of equal priority, the one that more tasks wait on,
+    directly or through other tasks, comes first, so work that unblocks
+    the most of the dependency graph is dispatched earliest.
+    """
+
+    def __init__(self, tasks: Iterable[Task]):
+        """Index tasks.
+
+        Args:
+            tasks: All tasks, in queue order.
+        """
+        self._tasks: Dict[str, Task] = {}
+        # Queue position, which breaks ties between equal priorities
+        self._order: Dict[str, int] = {}
+        self._unmet: Dict[str, int] = {}
+        self._waiting: Dict[str, List[str]] = defaultdict(list)
+        self._ready: Dict[str, Dict[str, Task]] = defaultdict(dict)
+        # Sorted ready tasks per agent, kept until that agent's set changes
+        self._sorted: Dict[str, List[Task]] = {}
+        # Transitive waiting-task counts, computed as ready() needs them and
+        # kept up to date as tasks are added
+        self._successors: Dict[str, int] = {}
+        for task in tasks:
+            self.update(task)
+
+    def update(self, task: Task) -> None:
+        """Add a new task or replace an existing one with its new state."""
+        old = self._tasks.get(task.id)
+        self._tasks[task.id] = task
+        if old is None:
+            self._order[task.id] = len(self._order)
+            if self._waiting.get(task.id):
+                # Tasks named this one as a dependency before it existed,
+                # so counts through it are unknown; recount as needed
+                self._successors.clear()
+                self._sorted.clear()
+            elif self._successors:
+                self._count_new_successor(task)
+            unmet = 0
+            for dep_id in task.dependencies:
+                self._waiting[dep_id].append(task.id)
+                dep_task = self._tasks.get(dep_id)
+                if dep_task is None or dep_task.status != TaskStatus.COMPLETED:
+                    unmet += 1
+            self._unmet[task.id] = unmet
+            was_completed = False
+        else:
+            was_completed = old.status == TaskStatus.COMPLETED
+
+        completed = task.status == TaskStatus.COMPLETED
+        if completed != was_completed:
+            step = -1 if completed else 1
+            for waiting_id in self._waiting.get(task.id, ()):
+                self._unmet[waiting_id] += step
+                self._refresh(waiting_id)
+        self._refresh(task.id)
+
+    def ready(self, agent_id: str) -> List[Task]:
+        """Return an agent's ready tasks in dispatch order.
+
+        Tasks are ordered by priority, then by how many tasks wait on them,
+        then by queue order. The list is shared until the agent's ready
+        tasks change, so repeated polls do not re-sort; callers must not
+        modify it.
+        """
+        ready = self._sorted.get(agent_id)
+        if ready is None:
+            ready = self._sorted[agent_id] = sorted(
+                self._ready.get(agent_id, {}).values(),
+                key=lambda t: (
+                    t.priority.value,
+                    -self._successor_count(t.id),
+                    self._order[t.id],
+                ),
+            )
+        return ready
+
+    def _successor_count(self, task_id: str) -> int:
+        """Count the tasks waiting on a task, directly or transitively."""
+        count = self._successors.get(task_id)
+        if count is None:
+            seen = set()
+            stack = list(self._waiting.get(task_id, ()))
+            while stack:
+                waiting_id = stack.pop()
+                if waiting_id not in seen:
+                    seen.add(waiting_id)
+                    stack.extend(self._waiting.get(waiting_id, ()))
+            count = self._successors[task_id] = len(seen)
+        return count
+
+    def _count_new_successor(self, task: Task) -> None:
+        """Add a new task, which nothing waits on, to its ancestors' counts.
+
+        Only agents with a ready ancestor need their order redone.
+        """
+        seen = {task.id}
+        stack = list(task.dependencies)
+        while stack:
+            dep_id = stack.pop()
+            dep_task = self._tasks.get(dep_id)
+            if dep_id in seen or dep_task is None:
+                continue
+            seen.add(dep_id)
+            stack.extend(dep_task.dependencies)
+            if dep_id in self._successors:
+                self._successors[dep_id] += 1
+                if dep_id in self._ready.get(dep_task.assigned_agent, {}):
+                    self._sorted.pop(dep_task.assigned_agent, None)
+
+    def _refresh(self, task_id: str) -> None:
+        """File a task under its agent's ready tasks, or remove it."""
+        task = self._tasks[task_id]
+        ready = self._ready[task.assigned_agent]
+        if task.status == TaskStatus.PENDING and not self._unmet[task_id]:
+            ready[task_id] = task
+        elif ready.pop(task_id, None) is None:
+            return
+        self._sorted.pop(task.assigned_agent, None)
 
 
 class TaskQueue:
@@ -76,8 +302,51 @@ class TaskQueue:
         self.queue_dir = Path(queue_dir)
         self.queue_dir.mkdir(parents=True, exist_ok=True)
         self.tasks_file = self.queue_dir / "tasks.json"
+        self.log_file = self.queue_dir / "tasks.log"
         self.completed_dir = self.queue_dir / "completed"
         self.completed_dir.mkdir(exist_ok=True)
+        self.pipelines_dir = self.queue_dir / "pipelines"
+        self.pipelines_dir.mkdir(exist_ok=True)
+        # Tasks by ID as last read from or written to storage, in queue
+        # order and updated in place, see snapshot(); the (mtime, size) of
+        # tasks_file and log_file they match; and what snapshot() hands
+        # out, built on demand and kept until the next write
+        self._snapshot: Optional[Dict[str, Task]] = None
+        self._snapshot_stamp: Optional[Tuple[Any, Any]] = None
+        self._snapshot_view: Optional[Tuple[List[Task], Dict[str, Task]]] = None
+        # Ready tasks of the snapshot, built on first use
+        self._ready_index: Optional[_ReadyIndex] = None
+        # Results of completed tasks, which do not change once recorded
+        self._results: Dict[str, Dict[str, Any]] = {}
+        # Serializes read-modify-write cycles when the queue is driven from
+        # worker threads (the workflow engine calls it via asyncio.to_thread)
+        self._lock = threading.RLock()
+        # Log entries held back by batch(), or None outside a batch
+        self._batch_lines: Optional[List[bytes]] = None
+        self._log_fd: Optional[int] = None
+        # Closes _log_fd when the queue is garbage collected or at exit
+        self._close_log: Optional[weakref.finalize] = None
+
+    @contextlib.contextmanager
+    def batch(self) -> Iterator[None]:
+        """Group task additions and updates into a single storage write.
+
+        Changes made inside the block show up in the snapshot right away,
+        but their log entries are appended together when the block exits.
+        Other threads wait for the block to finish.
+        """
+        with self._lock:
+            if self._batch_lines is not None:
+                # Nested; the outer block writes
+                yield
+                return
+            self._batch_lines = []
+            try:
+                yield
+            finally:
+                lines, self._batch_lines = self._batch_lines, None
+                if lines:
+                    self._write_log(lines)
 
     def add_task(
         self,
@@ -99,13 +368,13 @@ class TaskQueue:
         Returns:
             Created task ID.
         """
-        task_id = str(uuid.uuid4())[:8]
-        now = datetime.now().isoformat()
+        task_id = secrets.token_hex(4)
+        now = _now_iso()
 
         task = Task(
             id=task_id,
             title=title,
-            assigned_agent=assigned_agent,
+            assigned_agent=sys.intern(assigned_agent),
             status=TaskStatus.PENDING,
             priority=priority,
             dependencies=dependencies or [],
@@ -125,18 +394,15 @@ class TaskQueue:
             agent_id: Agent ID to get tasks for.
 
         Returns:
-            List of pending tasks sorted by priority.
+            List of pending tasks sorted by priority; among equal priorities,
+            tasks that more other tasks depend on come first.
         """
-        tasks = self._load_all_tasks()
-        agent_tasks = [
-            t
-            for t in tasks
-            if t.assigned_agent == agent_id
-            and t.status == TaskStatus.PENDING
-            and self._dependencies_satisfied(t, tasks)
-        ]
-        # Sort by priority (lower value = higher priority)
-        return sorted(agent_tasks, key=lambda t: t.priority.value)
+        with self._lock:
+            by_id = self._tasks_by_id()
+            if self._ready_index is None:
+                self._ready_index = _ReadyIndex(by_id.values())
+            # Sorted by priority (lower value = higher priority)
+            return [t.copy() for t in self._ready_index.ready(agent_id)]
 
     def get_task(self, task_id: str) -> Optional[Task]:
         """Get task by ID.
@@ -147,8 +413,61 @@ class TaskQueue:
         Returns:
             Task object or None if not found.
         """
-        tasks = self._load_all_tasks()
-        return next((t for t in tasks if t.id == task_id), None)
+        with self._lock:
+            task = self._tasks_by_id().get(task_id)
+        return task.copy() if task else None
+
+    def get_tasks(self, task_ids: Iterable[str]) -> Dict[str, Task]:
+        """Get several tasks by ID from the current snapshot.
+
+        Args:
+            task_ids: Task IDs to retrieve.
+
+        Returns:
+            Dictionary mapping found task IDs to their tasks. The tasks are
+            shared with snapshot() and must not be modified.
+        """
+        with self._lock:
+            by_id = self._tasks_by_id()
+            return {tid: by_id[tid] for tid in task_ids if tid in by_id}
+
+    def snapshot(self) -> Tuple[List[Task], Dict[str, Task]]:
+        """Get all tasks without re-reading storage when nothing changed.
+
+        Writes through this queue apply the tasks they wrote to the
+        snapshot, and storage is only parsed again when the modification
+        time or size of tasks_file or log_file shows it was changed from
+        outside. Callers must treat the returned tasks as read-only; use
+        get_task() for a copy that can be modified.
+
+        Returns:
+            Tuple of all tasks and a dictionary mapping task IDs to tasks.
+            The list stays as it was; the dictionary also reflects later
+            writes, so iterate over the list instead.
+        """
+        with self._lock:
+            by_id = self._tasks_by_id()
+            if self._snapshot_view is None:
+                self._snapshot_view = (list(by_id.values()), by_id)
+            return self._snapshot_view
+
+    def _tasks_by_id(self) -> Dict[str, Task]:
+        """Return the snapshot's tasks by ID, reloading them if stale.
+
+        The dictionary is updated in place by later writes through this
+        queue; callers must hold _lock while reading it.
+        """
+        with self._lock:
+            stamp = self._storage_stamp()
+            # Storage lags behind the snapshot while a batch is open
+            stale = stamp != self._snapshot_stamp and self._batch_lines is None
+            if self._snapshot is None or stale:
+                tasks = self._load_all_tasks()
+                self._snapshot = {t.id: t for t in tasks}
+                self._snapshot_view = None
+                self._snapshot_stamp = stamp
+                self._ready_index = None
+            return self._snapshot
 
     def update_task_status(
         self,
@@ -163,11 +482,14 @@ class TaskQueue:
             status: New task status.
             result: Optional task result data.
         """
-        tasks = self._load_all_tasks()
-        for task in tasks:
-            if task.id == task_id:
-                task.status = status
-                task.updated_at = datetime.now().isoformat()
+        with self._lock:
+            self._results.pop(task_id, None)
+            task = self._tasks_by_id().get(task_id)
+            if task is not None:
+                # Snapshot tasks are shared with readers, so the update goes
+                # to a new task that replaces the original. Only the changed
+                # fields differ; payload and dependencies are shared.
+                task = replace(task, status=status, updated_at=_now_iso())
                 if status == TaskStatus.IN_PROGRESS:
                     task.assigned_at = task.updated_at
                 elif status == TaskStatus.COMPLETED:
@@ -175,66 +497,182 @@ class TaskQueue:
                     task.result = result
                     # Move to completed directory
                     self._archive_task(task)
-                break
-        self._persist_tasks(tasks)
+                self._append_task(task)
         logger.info(f"Updated task {task_id} to status: {status.value}")
 
-    def _dependencies_satisfied(self, task: Task, all_tasks: List[Task]) -> bool:
-        """Check if all task dependencies are completed.
-
-        Args:
-            task: Task to check dependencies for.
-            all_tasks: All tasks in the system.
-
-        Returns:
-            True if all dependencies are satisfied, False otherwise.
-        """
-        if not task.dependencies:
-            return True
-
-        for dep_id in task.dependencies:
-            dep_task = next((t for t in all_tasks if t.id == dep_id), None)
-            if not dep_task or dep_task.status != TaskStatus.COMPLETED:
-                return False
-        return True
-
     def _persist_task(self, task: Task) -> None:
         """Save task to persistent storage.
 
         Args:
             task: Task to persist.
         """
-        tasks = self._load_all_tasks()
-        tasks.append(task)
-        self._persist_tasks(tasks)
+        with self._lock:
+            self._append_task(task)
 
     def _load_all_tasks(self) -> List[Task]:
         """Load all tasks from storage.
 
+        Tasks come from tasks_file, then each update in log_file replaces
+        the task it names or, for a new task, is added at the end.
+
         Returns:
             List of all tasks.
         """
+        tasks: Dict[str, Task] = {}
         if self.tasks_file.exists():
             try:
-                with open(self.tasks_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return [Task.from_dict(t) for t in data]
+                with open(self.tasks_file, "rb") as f:
+                    for data in orjson.loads(f.read()):
+                        task = Task.from_dict(data)
+                        tasks[task.id] = task
             except Exception as e:
                 logger.error(f"Failed to load tasks: {e}")
                 return []
-        return []
+        if self.log_file.exists():
+            try:
+                with open(self.log_file, "rb") as f:
+                    for line in f:
+                        try:
+                            entry = orjson.loads(line)
+                        except ValueError:
+                            # An entry cut short by a crash. _write_log starts
+                            # the next write on a fresh line, so later entries
+                            # are intact
+                            logger.warning("Skipping unreadable task log entry")
+                            continue
+                        if entry.get("op") == "upsert":
+                            task = Task.from_dict(entry["task"])
+                            tasks[task.id] = task
+            except Exception as e:
+                logger.error(f"Failed to replay task log: {e}")
+        return list(tasks.values())
+
+    @staticmethod
+    def _file_stamp(path: Path) -> Optional[Tuple[int, int]]:
+        """Return the (mtime, size) of a file, or None if it is missing."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _storage_stamp(self) -> Tuple[Any, Any]:
+        """Return the stamps of tasks_file and log_file, see _file_stamp()."""
+        return self._file_stamp(self.tasks_file), self._file_stamp(self.log_file)
+
+    def _set_snapshot(self, by_id: Dict[str, Task]) -> None:
+        """Make just-written tasks, keyed by task ID, the current snapshot."""
+        self._snapshot = by_id
+        self._snapshot_view = None
+        self._snapshot_stamp = self._storage_stamp()
+
+    def _append_task(self, task: Task) -> None:
+        """Log an added or updated task and apply it to the snapshot.
 
-    def _persist_tasks(self, tasks: List[Task]) -> None:
-        """Write tasks to storage.
+        Only the changed task is written, so an update costs the size of
+        one task rather than of the whole queue. The task replaces the one
+        with the same ID in the snapshot, keeping its place, or is added at
+        the end.
 
         Args:
-            tasks: List of tasks to persist.
+            task: The added or updated task; not modified afterwards.
+        """
+        self._tasks_by_id()[task.id] = task
+        self._snapshot_view = None
+        if self._ready_index is not None:
+            self._ready_index.update(task)
+        line = orjson.dumps(
+            {"op": "upsert", "task": task.to_dict()},
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+            default=str,
+        )
+        if self._batch_lines is not None:
+            self._batch_lines.append(line)
+        else:
+            self._write_log([line])
+
+    def _write_log(self, lines: List[bytes]) -> None:
+        """Append entries to log_file, compacting the log when it is large.
+
+        Args:
+            lines: Encoded log entries, already applied to the snapshot.
         """
         try:
-            with open(self.tasks_file, "w", encoding="utf-8") as f:
-                json.dump([t.to_dict() for t in tasks], f, indent=2, default=str)
+            if self._log_fd is not None and os.fstat(self._log_fd).st_nlink == 0:
+                # Another queue compacted the log away; start a new one
+                self.close()
+            if self._log_fd is None:
+                # Held open between writes; O_APPEND makes each write land
+                # at the current end of the file without reopening it
+                self._log_fd = os.open(
+                    self.log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644
+                )
+                self._close_log = weakref.finalize(self, os.close, self._log_fd)
+                if self._log_ends_mid_line():
+                    # A crash cut the last entry short; end its line so the
+                    # next entry is not appended to it
+                    lines = [b"\n", *lines]
+            os.write(self._log_fd, b"".join(lines))
+        except Exception as e:
+            logger.error(f"Failed to persist task updates: {e}")
+            # Fall back to whatever storage holds
+            self._snapshot = None
+            return
+        self._snapshot_stamp = self._storage_stamp()
+
+        tasks_stamp, log_stamp = self._snapshot_stamp
+        tasks_size = tasks_stamp[1] if tasks_stamp else 0
+        if log_stamp and log_stamp[1] > max(_LOG_COMPACT_MIN_BYTES, tasks_size):
+            self._persist_tasks(self._snapshot)
+
+    def _log_ends_mid_line(self) -> bool:
+        """Return whether log_file ends in a partial entry with no newline."""
+        try:
+            with open(self.log_file, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except OSError:
+            # Missing or empty
+            return False
+
+    def _persist_tasks(self, by_id: Dict[str, Task]) -> None:
+        """Rewrite tasks_file with all tasks and clear the update log.
+
+        Args:
+            by_id: All tasks keyed by task ID; becomes the snapshot.
+        """
+        # Updates still in the log only repeat what the new file holds, so
+        # dropping it last is safe
+        try:
+            _atomic_write(self.tasks_file, self._encode_tasks(by_id))
+            self.close()
+            self.log_file.unlink(missing_ok=True)
         except Exception as e:
             logger.error(f"Failed to persist tasks: {e}")
+            # Fall back to whatever storage holds
+            self._snapshot = None
+            return
+        self._set_snapshot(by_id)
+
+    @staticmethod
+    def _encode_tasks(by_id: Dict[str, Task]) -> Iterator[bytes]:
+        """Encode tasks as a JSON list one task at a time.
+
+        At most one task's encoding is held in memory rather than the
+        whole queue's.
+        """
+        separator = b"[\n"
+        for task in by_id.values():
+            yield separator
+            yield orjson.dumps(task.to_dict(), option=_JSON_OPTIONS, default=str)
+            separator = b",\n"
+        yield b"\n]" if by_id else b"[]"
+
+    def close(self) -> None:
+        """Release the task log file descriptor, if open."""
+        if self._log_fd is not None:
+            self._close_log()
+            self._log_fd = None
 
     def _archive_task(self, task: Task) -> None:
         """Archive completed task.
@@ -244,36 +682,124 @@ class TaskQueue:
         """
         try:
             archive_file = self.completed_dir / f"task_{task.id}.json"
-            with open(archive_file, "w", encoding="utf-8") as f:
-                json.dump(task.to_dict(), f, indent=2, default=str)
+            data = orjson.dumps(task.to_dict(), option=_JSON_OPTIONS, default=str)
+            _atomic_write(archive_file, [data])
         except Exception as e:
             logger.warning(f"Failed to archive task {task.id}: {e}")
 
-    def get_task_result(self, task_id: str) -> Optional[Dict[str, Any]]:
-        """Get result from completed task.
+    def save_pipeline_index(self, pipeline_id: str, tasks: Dict[str, str]) -> None:
+        """Record which tasks belong to a pipeline.
 
         Args:
-            task_id: Task ID to get result for.
+            pipeline_id: Pipeline identifier.
+            tasks: Mapping of pipeline step name to task ID.
+        """
+        try:
+            index_file = self.pipelines_dir / f"{pipeline_id}.json"
+            _atomic_write(index_file, [orjson.dumps(tasks, option=_JSON_OPTIONS)])
+        except Exception as e:
+            logger.warning(f"Failed to save index for pipeline {pipeline_id}: {e}")
+
+    def get_pipeline_task_ids(self, pipeline_id: str) -> Dict[str, str]:
+        """Get the tasks recorded for a pipeline.
+
+        Args:
+            pipeline_id: Pipeline identifier.
+
+        Returns:
+            Mapping of pipeline step name to task ID, empty if unknown.
+        """
+        index_file = self.pipelines_dir / f"{pipeline_id}.json"
+        if index_file.exists():
+            try:
+                with open(index_file, "rb") as f:
+                    return orjson.loads(f.read())
+            except Exception as e:
+                logger.warning(f"Failed to load index for pipeline {pipeline_id}: {e}")
+        return {}
+
+    def save_pipeline_results(
+        self, pipeline_id: str, results: Dict[str, Dict[str, Any]]
+    ) -> None:
+        """Write a finished pipeline's task results to a single file.
+
+        Args:
+            pipeline_id: Pipeline identifier.
+            results: Mapping of task ID to its title, status and result.
+        """
+        try:
+            results_file = self.pipelines_dir / f"{pipeline_id}_results.json"
+            data = orjson.dumps(results, option=_JSON_OPTIONS, default=str)
+            _atomic_write(results_file, [data])
+        except Exception as e:
+            logger.warning(f"Failed to save results for pipeline {pipeline_id}: {e}")
+
+    def get_pipeline_results(
+        self, pipeline_id: str
+    ) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Get the consolidated results of a finished pipeline.
+
+        Args:
+            pipeline_id: Pipeline identifier.
 
         Returns:
-            Task result dictionary or None if not found.
+            Mapping of task ID to its title, status and result, or None if
+            no consolidated file was written for the pipeline.
         """
-        task = self.get_task(task_id)
-        if task and task.result:
-            return task.result
+        results_file = self.pipelines_dir / f"{pipeline_id}_results.json"
+        if results_file.exists():
+            try:
+                with open(results_file, "rb") as f:
+                    return orjson.loads(f.read())
+            except Exception as e:
+                logger.warning(f"Failed to load results for pipeline {pipeline_id}: {e}")
+        return None
+
+    def get_archived_result(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get result from a completed task's archive file only.
+
+        Args:
+            task_id: Task ID to get result for.
 
-        # Check archived tasks
+        Returns:
+            Archived task result or None if the task is not archived.
+        """
         archive_file = self.completed_dir / f"task_{task_id}.json"
         if archive_file.exists():
             try:
-                with open(archive_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                    return data.get("result")
+                with open(archive_file, "rb") as f:
+                    return orjson.loads(f.read()).get("result")
             except Exception as e:
                 logger.warning(f"Failed to load archived task result: {e}")
-
         return None
 
+    def get_task_result(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Get result from completed task.
+
+        Args:
+            task_id: Task ID to get result for.
+
+        Returns:
+            Task result dictionary or None if not found. Results of
+            completed tasks are cached and shared, so callers must copy
+            them before making changes.
+        """
+        with self._lock:
+            cached = self._results.get(task_id)
+            if cached is not None:
+                return cached
+
+            task = self._tasks_by_id().get(task_id)
+            if task and task.result:
+                result = task.result
+            else:
+                # Check archived tasks
+                result = self.get_archived_result(task_id)
+
+            if result and (task is None or task.status == TaskStatus.COMPLETED):
+                self._results[task_id] = result
+            return result
+
 
 class Coordinator:
     """Central coordination engine for workflow orchestration."""
@@ -297,81 +823,86 @@ class Coordinator:
         Returns:
             Dictionary with pipeline information and task IDs.
         """
-        pipeline_id = str(uuid.uuid4())[:8]
-
-        # Step 1: Research task
-        research_task_id = self.task_queue.add_task(
-            title=f"Research: {topic}",
-            assigned_agent="agent:researcher:main",
-            payload={"topic": topic, "max_sources": 5, "id": ""},
-            priority=TaskPriority.HIGH,
-        )
-
-        # Step 2: Analysis task (depends on research)
-        analysis_task_id = self.task_queue.add_task(
-            title=f"Analyze: {topic}",
-            assigned_agent="agent:analyst:main",
-            payload={
-                "research_task_id": research_task_id,
-                "research_data": {},
-                "id": "",
-            },
-            dependencies=[research_task_id],
-            priority=TaskPriority.HIGH,
-        )
-
-        # Step 3: Writing task (depends on analysis)
-        writing_task_id = self.task_queue.add_task(
-            title=f"Write: {topic}",
-            assigned_agent="agent:writer:main",
-            payload={
-                "analysis_task_id": analysis_task_id,
-                "outline": {},
-                "style_guide": "professional",
-                "research_data": {},
-                "id": "",
-            },
-            dependencies=[analysis_task_id],
-            priority=TaskPriority.MEDIUM,
-        )
-
-        # Step 4: SEO optimization (depends on writing)
-        seo_task_id = self.task_queue.add_task(
-            title=f"SEO Optimize: {topic}",
-            assigned_agent="agent:seo:main",
-            payload={
-                "writing_task_id": writing_task_id,
-                "content": "",
-                "topic": topic,
-                "id": "",
-            },
-            dependencies=[writing_task_id],
-            priority=TaskPriority.MEDIUM,
-        )
-
-        # Step 5: Quality check (depends on SEO)
-        quality_task_id = self.task_queue.add_task(
-            title=f"Quality Check: {topic}",
-            assigned_agent="agent:quality:main",
-            payload={
-                "seo_task_id": seo_task_id,
-                "content": "",
-                "seo_data": {},
-                "id": "",
-            },
-            dependencies=[seo_task_id],
-            priority=TaskPriority.HIGH,
-        )
+        pipeline_id = secrets.token_hex(4)
+
+        # Create all five tasks with a single queue write
+        with self.task_queue.batch():
+            # Step 1: Research task
+            research_task_id = self.task_queue.add_task(
+                title=f"Research: {topic}",
+                assigned_agent="agent:researcher:main",
+                payload={"topic": topic, "max_sources": 5, "id": ""},
+                priority=TaskPriority.HIGH,
+            )
+
+            # Step 2: Analysis task (depends on research)
+            analysis_task_id = self.task_queue.add_task(
+                title=f"Analyze: {topic}",
+                assigned_agent="agent:analyst:main",
+                payload={
+                    "research_task_id": research_task_id,
+                    "research_data": {},
+                    "id": "",
+                },
+                dependencies=[research_task_id],
+                priority=TaskPriority.HIGH,
+            )
+
+            # Step 3: Writing task (depends on analysis)
+            writing_task_id = self.task_queue.add_task(
+                title=f"Write: {topic}",
+                assigned_agent="agent:writer:main",
+                payload={
+                    "analysis_task_id": analysis_task_id,
+                    "outline": {},
+                    "style_guide": "professional",
+                    "research_data": {},
+                    "id": "",
+                },
+                dependencies=[analysis_task_id],
+                priority=TaskPriority.MEDIUM,
+            )
+
+            # Step 4: SEO optimization (depends on writing)
+            seo_task_id = self.task_queue.add_task(
+                title=f"SEO Optimize: {topic}",
+                assigned_agent="agent:seo:main",
+                payload={
+                    "writing_task_id": writing_task_id,
+                    "content": "",
+                    "topic": topic,
+                    "id": "",
+                },
+                dependencies=[writing_task_id],
+                priority=TaskPriority.MEDIUM,
+            )
+
+            # Step 5: Quality check (depends on SEO)
+            quality_task_id = self.task_queue.add_task(
+                title=f"Quality Check: {topic}",
+                assigned_agent="agent:quality:main",
+                payload={
+                    "seo_task_id": seo_task_id,
+                    "content": "",
+                    "seo_data": {},
+                    "id": "",
+                },
+                dependencies=[seo_task_id],
+                priority=TaskPriority.HIGH,
+            )
+
+        tasks = {
+            "research": research_task_id,
+            "analysis": analysis_task_id,
+            "writing": writing_task_id,
+            "seo": seo_task_id,
+            "quality": quality_task_id,
+        }
+        self.task_queue.save_pipeline_index(pipeline_id, tasks)
 
         return {
             "pipeline_id": pipeline_id,
             "topic": topic,
-            "tasks": {
-                "research": research_task_id,
-                "analysis": analysis_task_id,
-                "writing": writing_task_id,
-                "seo": seo_task_id,
-                "quality": quality_task_id,
-            },
+            "tasks": tasks,
         }
 
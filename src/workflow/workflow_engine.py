@@ -1,16 +1,19 @@
 """Main workflow orchestration engine."""
 
 import asyncio
-import json
 import logging
+from collections import Counter, defaultdict, deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+import orjson
 
 from src.config.settings import (
     AGENT_CONFIGURATIONS,
     EnvironmentConfig,
 )
 from src.agents.base_agent import BaseAgent
+from src.agents.llm_cache import CacheStats
 from src.agents.research_agent import ResearchAgent
 from src.agents.analyst_agent import AnalystAgent
 from src.agents.writer_agent import WriterAgent
@@ -19,6 +22,7 @@ from src.agents.quality_agent import QualityAgent
 from src.agents.coordinator_agent import CoordinatorAgent
 from src.orchestration.task_manager import (
     Coordinator,
+    Task,
     TaskQueue,
     TaskStatus,
     TaskPriority,
@@ -26,6 +30,16 @@ from src.orchestration.task_manager import (
 
 logger = logging.getLogger(__name__)
 
+# Configuration name -> agent class; the coordinator is built separately
+# because it needs the other agents
+AGENT_CLASS_MAP: Dict[str, Type[BaseAgent]] = {
+    "researcher": ResearchAgent,
+    "analyst": AnalystAgent,
+    "writer": WriterAgent,
+    "seo_specialist": SEOAgent,
+    "quality_checker": QualityAgent,
+}
+
 
 class WorkflowEngine:
     """Main workflow orchestration engine."""
@@ -50,60 +64,20 @@ class WorkflowEngine:
         for agent_name, config in AGENT_CONFIGURATIONS.items():
             Path(config.workspace_path).mkdir(parents=True, exist_ok=True)
 
-            agent = None
-
-            if agent_name == "researcher":
-                agent = ResearchAgent(
-                    agent_id=config.agent_id,
-                    role=config.role_name,
-                    memory_dir=config.workspace_path,
-                    api_key=self.api_key,
-                    model=config.model_config.primary,
-                    system_prompt=config.system_prompt,
-                )
-            elif agent_name == "analyst":
-                agent = AnalystAgent(
-                    agent_id=config.agent_id,
-                    role=config.role_name,
-                    memory_dir=config.workspace_path,
-                    api_key=self.api_key,
-                    model=config.model_config.primary,
-                    system_prompt=config.system_prompt,
-                )
-            elif agent_name == "writer":
-                agent = WriterAgent(
-                    agent_id=config.agent_id,
-                    role=config.role_name,
-                    memory_dir=config.workspace_path,
-                    api_key=self.api_key,
-                    model=config.model_config.primary,
-                    system_prompt=config.system_prompt,
-                )
-            elif agent_name == "seo_specialist":
-                agent = SEOAgent(
-                    agent_id=config.agent_id,
-                    role=config.role_name,
-                    memory_dir=config.workspace_path,
-                    api_key=self.api_key,
-                    model=config.model_config.primary,
-                    system_prompt=config.system_prompt,
-                )
-            elif agent_name == "quality_checker":
-                agent = QualityAgent(
-                    agent_id=config.agent_id,
-                    role=config.role_name,
-                    memory_dir=config.workspace_path,
-                    api_key=self.api_key,
-                    model=config.model_config.primary,
-                    system_prompt=config.system_prompt,
-                )
-            elif agent_name == "coordinator":
+            agent_class = AGENT_CLASS_MAP.get(agent_name)
+            if agent_class is None:
                 # Coordinator will be initialized after other agents
                 continue
 
-            if agent:
-                self.agents[config.agent_id] = agent
-                logger.info(f"Initialized {config.role_name}: {config.agent_id}")
+            self.agents[config.agent_id] = agent_class(
+                agent_id=config.agent_id,
+                role=config.role_name,
+                memory_dir=config.workspace_path,
+                api_key=self.api_key,
+                model=config.model_config.primary,
+                system_prompt=config.system_prompt,
+            )
+            logger.info(f"Initialized {config.role_name}: {config.agent_id}")
 
         # Initialize coordinator with available agents
         coordinator_config = AGENT_CONFIGURATIONS["coordinator"]
@@ -123,49 +97,178 @@ class WorkflowEngine:
         logger.info("Workflow engine initialized")
 
     async def process_pending_tasks(self) -> Dict[str, Any]:
-        """Process all pending tasks for each agent.
+        """Run every pending task in the queue, as run_pipeline() does.
 
         Returns:
-            Dictionary with processing results.
+            Dictionary with the number of tasks completed, results by task
+            ID and the number of scheduling rounds.
         """
-        results = {}
-        tasks_processed = 0
+        snapshot, _ = await asyncio.to_thread(self.task_queue.snapshot)
+        return await self._run_tasks(
+            [task.id for task in snapshot if task.status == TaskStatus.PENDING]
+        )
 
-        for agent_id, agent in self.agents.items():
-            if agent_id == "agent:coordinator:main":
-                continue  # Skip coordinator for now
+    async def run_pipeline(self, pipeline_id: str) -> Dict[str, Any]:
+        """Run a pipeline's tasks, starting each as soon as it is unblocked.
+
+        Args:
+            pipeline_id: Pipeline ID.
 
-            pending_tasks = self.task_queue.get_pending_tasks(agent_id)
+        Returns:
+            Dictionary with the number of tasks completed, results by task
+            ID and the number of scheduling rounds.
+        """
+        task_ids = await asyncio.to_thread(
+            self.task_queue.get_pipeline_task_ids, pipeline_id
+        )
+        return await self._run_tasks(task_ids.values())
 
-            for task in pending_tasks:
-                logger.info(f"Processing task {task.id}: {task.title}")
-                self.task_queue.update_task_status(task.id, TaskStatus.IN_PROGRESS)
+    async def _run_tasks(self, task_ids: Iterable[str]) -> Dict[str, Any]:
+        """Run pending tasks, starting each as soon as it is unblocked.
 
-                try:
-                    # Update task payload with ID
-                    task.payload["id"] = task.id
-                    
-                    # Load data from dependent tasks before execution
-                    self._load_dependent_task_data(task)
+        Tasks are scheduled with Kahn's algorithm: every task tracks how
+        many of its dependencies are still unfinished, and when a task
+        completes, each dependent whose count drops to zero starts right
+        away, so independent branches run side by side. Dependents of a
+        failed task are never started. Task queue calls do blocking file
+        I/O, so they run in worker threads.
 
-                    # Execute task
-                    result = await agent.execute_task(task.payload)
+        Args:
+            task_ids: IDs of the tasks to run; tasks that are not pending
+                or belong to the coordinator are left alone.
 
-                    # Update task status
-                    self.task_queue.update_task_status(
-                        task.id, TaskStatus.COMPLETED, result
-                    )
+        Returns:
+            Dictionary with the number of tasks completed, results by task
+            ID and the number of scheduling rounds.
+        """
+        tasks = await asyncio.to_thread(self.task_queue.get_tasks, task_ids)
+        dependencies = await asyncio.to_thread(
+            self.task_queue.get_tasks,
+            {dep_id for task in tasks.values() for dep_id in task.dependencies},
+        )
 
-                    results[task.id] = result
+        # Unfinished dependency count per pending task, and the reverse
+        # edges used to update the counts as dependencies complete
+        in_degree: Dict[str, int] = {}
+        dependents: Dict[str, List[str]] = defaultdict(list)
+        ready: "deque[str]" = deque()
+        for task in tasks.values():
+            if (
+                task.status != TaskStatus.PENDING
+                or task.assigned_agent not in self.agents
+                or task.assigned_agent == "agent:coordinator:main"
+            ):
+                continue
+            unmet = [
+                dep_id
+                for dep_id in set(task.dependencies)
+                if dep_id not in dependencies
+                or dependencies[dep_id].status != TaskStatus.COMPLETED
+            ]
+            in_degree[task.id] = len(unmet)
+            for dep_id in unmet:
+                dependents[dep_id].append(task.id)
+            if not unmet:
+                ready.append(task.id)
+
+        max_parallel = max(1, EnvironmentConfig.MAX_PARALLEL_TASKS)
+        running: Dict["asyncio.Future[Tuple[bool, Dict[str, Any]]]", str] = {}
+        results: Dict[str, Any] = {}
+        tasks_processed = 0
+        rounds = 0
+
+        try:
+            while ready or running:
+                while ready and len(running) < max_parallel:
+                    task = tasks[ready.popleft()]
+                    agent = self.agents[task.assigned_agent]
+                    future = asyncio.ensure_future(self._execute_task(task, agent))
+                    running[future] = task.id
+
+                done, _ = await asyncio.wait(
+                    running, return_when=asyncio.FIRST_COMPLETED
+                )
+                rounds += 1
+                for future in done:
+                    task_id = running.pop(future)
+                    succeeded, results[task_id] = future.result()
+                    if not succeeded:
+                        continue
                     tasks_processed += 1
-                    logger.info(f"Task {task.id} completed successfully")
+                    for dependent_id in dependents.pop(task_id, ()):
+                        in_degree[dependent_id] -= 1
+                        if in_degree[dependent_id] == 0:
+                            ready.append(dependent_id)
+        finally:
+            # If a task was cancelled or the run itself is, stop the rest
+            # rather than leave them running unsupervised, and wait until
+            # they have put their tasks back
+            for future in running:
+                future.cancel()
+            await asyncio.gather(*running, return_exceptions=True)
 
-                except Exception as e:
-                    logger.error(f"Task {task.id} failed: {str(e)}")
-                    self.task_queue.update_task_status(task.id, TaskStatus.FAILED)
-                    results[task.id] = {"status": "failed", "error": str(e)}
+        return {
+            "tasks_processed": tasks_processed,
+            "results": results,
+            "rounds": rounds,
+        }
+
+    async def _execute_task(
+        self, task: Task, agent: BaseAgent
+    ) -> Tuple[bool, Dict[str, Any]]:
+        """Run a task on its agent and record the outcome in the queue.
+
+        Args:
+            task: Pending task to run; not modified.
+            agent: Agent assigned to the task.
 
-        return {"tasks_processed": tasks_processed, "results": results}
+        Returns:
+            Whether the task completed, and its result or error details.
+        """
+        # Tasks from the queue are shared with its snapshot, and the
+        # payload is filled in below
+        task = task.copy()
+        logger.info(f"Processing task {task.id}: {task.title}")
+
+        # Update task payload with ID
+        task.payload["id"] = task.id
+
+        try:
+            await self._set_task_status(task.id, TaskStatus.IN_PROGRESS)
+            # Load data from dependent tasks before execution
+            await asyncio.to_thread(self._load_dependent_task_data, task)
+            result = await agent.run_task(task.payload)
+        except asyncio.CancelledError:
+            # Interrupted rather than failed; make it pending again so a
+            # later run picks it up
+            logger.warning(f"Task {task.id} cancelled")
+            await self._set_task_status(task.id, TaskStatus.PENDING)
+            raise
+        except Exception as e:
+            logger.error(f"Task {task.id} failed: {str(e)}")
+            await self._set_task_status(task.id, TaskStatus.FAILED)
+            return False, {"status": "failed", "error": str(e)}
+
+        await self._set_task_status(task.id, TaskStatus.COMPLETED, result)
+        logger.info(f"Task {task.id} completed successfully")
+        return True, result
+
+    async def _set_task_status(
+        self,
+        task_id: str,
+        status: TaskStatus,
+        result: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Update a task's status without blocking the event loop.
+
+        Args:
+            task_id: Task ID to update.
+            status: New task status.
+            result: Optional task result data.
+        """
+        await asyncio.to_thread(
+            self.task_queue.update_task_status, task_id, status, result
+        )
 
     def _load_dependent_task_data(self, task) -> None:
         """Load data from dependent tasks into current task payload.
@@ -173,30 +276,26 @@ class WorkflowEngine:
         Args:
             task: Task to load data for.
         """
-        # Load research data for analyst
-        if "research_task_id" in task.payload:
-            research_task_id = task.payload.get("research_task_id")
-            if research_task_id:
-                research_result = self.task_queue.get_task_result(research_task_id)
-                if research_result:
-                    task.payload["research_data"] = research_result
-                    logger.info(f"Loaded research data for task {task.id}")
-
-        # Load analysis data (outline + research) for writer
+        # Research data is used by both the analyst and the writer, so it
+        # is fetched once. Results are shared with the task queue's cache,
+        # so the payload gets its own copy.
+        research_task_id = task.payload.get("research_task_id")
+        research_result = None
+        if research_task_id:
+            research_result = self.task_queue.get_task_result(research_task_id)
+
+        # Load research data for analyst and writer
+        if research_result:
+            task.payload["research_data"] = dict(research_result)
+            logger.info(f"Loaded research data for task {task.id}")
+
+        # Load analysis outline for writer
         if "analysis_task_id" in task.payload:
             analysis_task_id = task.payload.get("analysis_task_id")
             if analysis_task_id:
                 analysis_result = self.task_queue.get_task_result(analysis_task_id)
                 if analysis_result:
                     task.payload["outline"] = analysis_result.get("outline", {})
-                    # Also load research data
-                    research_task_id = task.payload.get("research_task_id")
-                    if research_task_id:
-                        research_result = self.task_queue.get_task_result(
-                            research_task_id
-                        )
-                        if research_result:
-                            task.payload["research_data"] = research_result
                     logger.info(f"Loaded analysis data for task {task.id}")
 
         # Load writing data for SEO
@@ -242,63 +341,94 @@ class WorkflowEngine:
 
         # Create pipeline
         pipeline = await self.coordinator.execute_content_pipeline(topic)
-        logger.info(f"Pipeline created: {json.dumps(pipeline, indent=2)}")
-
-        # Process tasks iteratively until all complete
-        max_iterations = EnvironmentConfig.MAX_ITERATIONS
-        iteration = 0
-        all_results = {}
-
-        while iteration < max_iterations:
-            # Propagate data from completed tasks
-            completed_tasks = [
-                t
-                for t in self.task_queue._load_all_tasks()
-                if t.status == TaskStatus.COMPLETED and t.result
-            ]
-            for task in completed_tasks:
-                self._propagate_task_data(task.id, task.result)
-
-            # Process pending tasks
-            processing_results = await self.process_pending_tasks()
-
-            if processing_results["tasks_processed"] == 0:
-                # Check if all tasks are complete
-                all_tasks = self.task_queue._load_all_tasks()
-                pipeline_tasks = [
-                    t
-                    for t in all_tasks
-                    if t.id in pipeline["tasks"].values()
-                ]
-                if all(t.status == TaskStatus.COMPLETED for t in pipeline_tasks):
-                    logger.info("All pipeline tasks completed")
-                    break
-                elif all(
-                    t.status in [TaskStatus.COMPLETED, TaskStatus.FAILED]
-                    for t in pipeline_tasks
-                ):
-                    logger.warning("Pipeline completed with some failures")
-                    break
-
-            all_results.update(processing_results["results"])
-            iteration += 1
-            await asyncio.sleep(1)
-
-        # Collect final results
-        final_results = {}
-        for task_id in pipeline["tasks"].values():
-            task = self.task_queue.get_task(task_id)
-            if task and task.result:
-                final_results[task_id] = task.result
-
-        logger.info(f"Pipeline execution completed after {iteration} iterations")
+        if logger.isEnabledFor(logging.INFO):
+            pipeline_json = orjson.dumps(pipeline, option=orjson.OPT_INDENT_2).decode()
+            logger.info(f"Pipeline created: {pipeline_json}")
+
+        run = await self.run_pipeline(pipeline["pipeline_id"])
+
+        # Collect final results; once every task has finished, store them
+        # in one consolidated file so later lookups are a single read
+        tasks = await asyncio.to_thread(
+            self.task_queue.get_tasks, pipeline["tasks"].values()
+        )
+        if tasks and all(
+            t.status in (TaskStatus.COMPLETED, TaskStatus.FAILED)
+            for t in tasks.values()
+        ):
+            consolidated = {
+                task_id: {
+                    "title": task.title,
+                    "status": task.status.value,
+                    "result": task.result,
+                }
+                for task_id, task in tasks.items()
+            }
+            await asyncio.to_thread(
+                self.task_queue.save_pipeline_results,
+                pipeline["pipeline_id"],
+                consolidated,
+            )
+            final_results = {
+                task_id: task.result
+                for task_id, task in tasks.items()
+                if task.result
+            }
+        else:
+            final_results = await self.get_pipeline_results(pipeline["pipeline_id"])
+
+        # Agents persist task outcomes in the background; make sure the
+        # session and result files are written before reporting completion
+        await asyncio.gather(*(agent.flush_outcomes() for agent in self.agents.values()))
+
+        logger.info(f"Pipeline execution completed after {run['rounds']} rounds")
 
         return {
             "pipeline": pipeline,
-            "iterations": iteration,
+            "iterations": run["rounds"],
             "results": final_results,
         }
 
+    async def get_pipeline_results(self, pipeline_id: str) -> Dict[str, Any]:
+        """Get results of a pipeline's completed tasks.
+
+        Args:
+            pipeline_id: Pipeline ID.
+
+        Returns:
+            Dictionary mapping task IDs to their results.
+        """
+        consolidated = await asyncio.to_thread(
+            self.task_queue.get_pipeline_results, pipeline_id
+        )
+        if consolidated is not None:
+            return {
+                task_id: entry["result"]
+                for task_id, entry in consolidated.items()
+                if entry.get("result")
+            }
+
+        task_ids = list(self.task_queue.get_pipeline_task_ids(pipeline_id).values())
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(self.task_queue.get_archived_result, task_id)
+                for task_id in task_ids
+            )
+        )
+        return {
+            task_id: result
+            for task_id, result in zip(task_ids, results)
+            if result
+        }
+
+    def llm_cache_stats(self) -> CacheStats:
+        """Get LLM cache counters summed over all agents.
+
+        Returns:
+            Combined cache statistics.
+        """
+        return sum((agent.llm_cache.stats for agent in self.agents.values()), CacheStats())
+
     def get_pipeline_status(self, pipeline_id: str) -> Dict[str, Any]:
         """Get status of a pipeline.
 
@@ -308,14 +438,20 @@ class WorkflowEngine:
         Returns:
             Dictionary with pipeline status.
         """
-        all_tasks = self.task_queue._load_all_tasks()
         status = {
             "pipeline_id": pipeline_id,
             "tasks": {},
             "overall_status": "unknown",
         }
 
-        for task in all_tasks:
+        task_ids = self.task_queue.get_pipeline_task_ids(pipeline_id)
+        if not task_ids:
+            return status
+
+        # Collect task details and tally statuses in a single pass
+        counts: Counter = Counter()
+        for task in self.task_queue.get_tasks(task_ids.values()).values():
+            counts[task.status] += 1
             status["tasks"][task.id] = {
                 "title": task.title,
                 "status": task.status.value,
@@ -323,15 +459,13 @@ class WorkflowEngine:
             }
 
         # Determine overall status
-        task_statuses = [t["status"] for t in status["tasks"].values()]
-        if all(s == "completed" for s in task_statuses):
+        if counts[TaskStatus.COMPLETED] == len(status["tasks"]):
             status["overall_status"] = "completed"
-        elif any(s == "failed" for s in task_statuses):
+        elif counts[TaskStatus.FAILED]:
             status["overall_status"] = "failed"
-        elif any(s == "in_progress" for s in task_statuses):
+        elif counts[TaskStatus.IN_PROGRESS]:
             status["overall_status"] = "in_progress"
         else:
             status["overall_status"] = "pending"
 
         return status
-
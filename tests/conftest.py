@@ -0,0 +1,20 @@
+"""Shared fixtures for the test suite."""
+
+import pytest
+
+
+@pytest.fixture
+def mock_stream():
+    """Return a factory for call_llm_stream replacements.
+
+    The factory takes the fragments the replacement should yield.
+    """
+
+    def build(*fragments):
+        async def stream(*args, **kwargs):
+            for fragment in fragments:
+                yield fragment
+
+        return stream
+
+    return build
@@ -2,10 +2,20 @@
 
 import pytest
 import asyncio
+import time
+from collections import Counter
 from pathlib import Path
 from unittest.mock import Mock, patch, AsyncMock
 
-from src.agents.base_agent import ResearchAgent, WriterAgent, AgentMemory
+from src.agents.analyst_agent import AnalystAgent
+from src.agents.base_agent import AgentMemory
+from src.agents.coordinator_agent import CoordinatorAgent
+from src.agents.llm_cache import LLMCache
+from src.agents.quality_agent import QualityAgent
+from src.agents.rate_limiter import RateLimiter
+from src.agents.research_agent import ResearchAgent
+from src.agents.seo_agent import SEOAgent
+from src.agents.writer_agent import WriterAgent
 from src.orchestration.task_manager import (
     TaskQueue,
     TaskStatus,
@@ -131,11 +141,12 @@ async def test_research_agent_execution(temp_workspace):
 
 
 @pytest.mark.asyncio
-async def test_writer_agent_execution(temp_workspace):
+async def test_writer_agent_execution(temp_workspace, mock_stream):
     """Test writer agent task execution."""
-    with patch("src.agents.writer_agent.WriterAgent.call_llm") as mock_llm:
-        mock_llm.return_value = "# Test Article\n\nContent here."
-
+    with patch(
+        "src.agents.writer_agent.WriterAgent.call_llm_stream",
+        mock_stream("# Test Art", "icle  \n\n\n\nContent", " here.\n"),
+    ):
         agent = WriterAgent(
             agent_id="test:writer",
             role="Test Writer",
@@ -161,6 +172,363 @@ async def test_writer_agent_execution(temp_workspace):
         assert "content" in result
         assert "word_count" in result
         assert result["word_count"] > 0
+        assert result["content"] == "# Test Article\n\nContent here."
+
+
+def _mock_completion(text):
+    """Build a Groq-style chat completion response."""
+    message = Mock(content=text)
+    return Mock(choices=[Mock(message=message)], usage=None)
+
+
+@pytest.mark.asyncio
+async def test_call_llm_caches_deterministic_calls(temp_workspace):
+    """Test temperature-0 completions are served from the prompt cache."""
+    agent = ResearchAgent(
+        agent_id="test:researcher",
+        role="Test Researcher",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+    )
+    client = Mock()
+    client.chat.completions.create = AsyncMock(
+        return_value=_mock_completion("Cached answer")
+    )
+
+    with patch.object(ResearchAgent, "_get_client", return_value=client):
+        first = await agent.call_llm("Same prompt", max_tokens=64, temperature=0)
+        second = await agent.call_llm("Same prompt", max_tokens=64, temperature=0)
+        await agent.call_llm("Same prompt", max_tokens=64)
+
+    assert first == second == "Cached answer"
+    # The cached call is skipped; the sampled call always hits the API
+    assert client.chat.completions.create.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_persists_to_disk(temp_workspace):
+    """Test cached completions survive a new cache instance."""
+    messages = [{"role": "user", "content": "Hello"}]
+    assert LLMCache.cache_key("model", messages, 0.7) is None
+
+    key = LLMCache.cache_key("model", messages, 0)
+    assert key == LLMCache.cache_key("model", list(messages), 0.0)
+
+    await LLMCache(Path(temp_workspace)).set(key, "Hi there", tokens=12)
+    cache = LLMCache(Path(temp_workspace))
+    assert await cache.get(key) == "Hi there"
+    assert await cache.get("missing") is None
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.tokens_saved) == (1, 1, 12)
+
+    # Surrounding whitespace is ignored but layout inside the text is not;
+    # expired entries miss
+    padded = [{"role": "user", "content": "  Hello\n"}]
+    assert LLMCache.cache_key("model", padded, 0) == key
+    reflowed = [{"role": "user", "content": "# Title\n\nBody"}]
+    assert LLMCache.cache_key("model", reflowed, 0) != LLMCache.cache_key(
+        "model", [{"role": "user", "content": "# Title Body"}], 0
+    )
+    await cache.set(key, "Fresh", ttl_seconds=60)
+    assert await LLMCache(Path(temp_workspace)).get(key) == "Fresh"
+    with patch("src.agents.llm_cache.time.time", return_value=time.time() + 120):
+        assert await LLMCache(Path(temp_workspace)).get(key) is None
+
+
+@pytest.mark.asyncio
+async def test_route_task_uses_tool_call(temp_workspace):
+    """Test routing reads the agent from the structured tool call."""
+    agent = CoordinatorAgent(
+        agent_id="test:coordinator",
+        role="Test Coordinator",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+        available_agents={},
+    )
+    tool_call = Mock()
+    tool_call.function.arguments = '{"agent": "writer", "reasoning": "Drafting"}'
+    message = Mock(content=None, tool_calls=[tool_call])
+    client = Mock()
+    client.chat.completions.create = AsyncMock(
+        return_value=Mock(choices=[Mock(message=message)], usage=None)
+    )
+
+    with patch.object(CoordinatorAgent, "_get_client", return_value=client):
+        result = await agent._route_task({"description": "Draft a blog post"})
+
+    assert result["recommended_agent"] == "writer"
+    assert result["reasoning"] == "Drafting"
+    kwargs = client.chat.completions.create.await_args.kwargs
+    assert kwargs["tool_choice"]["function"]["name"] == "route_task"
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_caps_concurrency():
+    """Test no more than max_concurrency requests run at once."""
+    limiter = RateLimiter(max_concurrency=2)
+    active = peak = 0
+
+    async def request():
+        nonlocal active, peak
+        async with limiter.slot():
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+    await asyncio.gather(*(request() for _ in range(6)))
+    assert peak == 2
+
+
+def test_analyst_parses_llm_lists(temp_workspace):
+    """Test category lists and outline sections are parsed from LLM text."""
+    agent = AnalystAgent(
+        agent_id="test:analyst",
+        role="Test Analyst",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+    )
+    insights = "## Main Trends\n- Trend A\n\n- Trend B\nSummary text\n- Not a trend\n"
+    assert agent._parse_list_items(insights, "Trends") == ["Trend A", "Trend B"]
+    assert agent._parse_list_items(insights, "Patterns") == [
+        "Patterns item 1",
+        "Patterns item 2",
+    ]
+
+    outline = "## Introduction\n- Hook\n1. Main Section\n- Point 1\n- Point 2\n"
+    assert agent._parse_outline_sections(outline) == [
+        {"title": "Introduction", "subsections": ["Hook"]},
+        {"title": "Main Section", "subsections": ["Point 1", "Point 2"]},
+    ]
+
+    # Rules and blank bullets are not items; lines naming the category are
+    # skipped; digits in the item text are kept
+    insights = "## Trends\n---\n-  \n- Trends rising\n- 45% of users\n1) Growth\n"
+    assert agent._parse_list_items(insights, "Trends") == ["45% of users", "Growth"]
+
+    # Section numbers are dropped from headings and a bare heading still
+    # starts a section
+    outline = "## 1. Introduction\n- a\n---\n## 2.3 Details\n##\n- b\n"
+    assert agent._parse_outline_sections(outline) == [
+        {"title": "Introduction", "subsections": ["a"]},
+        {"title": "Details", "subsections": []},
+        {"title": "", "subsections": ["b"]},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_analyst_skips_llm_without_research(temp_workspace):
+    """Test empty research data falls back without calling the LLM."""
+    agent = AnalystAgent(
+        agent_id="test:analyst",
+        role="Test Analyst",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+    )
+    with patch.object(agent, "call_llm") as mock_llm:
+        result = await agent.execute_task({"id": "task_empty"})
+
+    mock_llm.assert_not_called()
+    assert result["fact_check"]["status"] == "skipped"
+    assert result["outline"]["title"] == "Guide to Unknown"
+
+    # Summaries that are not dicts are scanned as text
+    assert agent._resolve_topic({"summaries": ["Best MacBooks of 2024"]}) == "macbooks"
+
+
+@pytest.mark.asyncio
+async def test_quality_review_uses_single_tool_call(temp_workspace):
+    """Test grammar, fact and style reviews share one LLM request."""
+    agent = QualityAgent(
+        agent_id="test:quality",
+        role="Test Quality",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+    )
+    review = {
+        "grammar": {"issues_found": 2, "feedback": "Two typos", "score": 80},
+        "facts": {"issues_found": 0, "feedback": "Accurate", "score": 95},
+        "style": {"issues_found": 0, "feedback": "Clear", "score": 120},
+    }
+    with patch.object(agent, "call_llm_tool", AsyncMock(return_value=review)):
+        with patch.object(agent, "call_llm") as mock_llm:
+            result = await agent.execute_task({"id": "task_q", "content": "Text"})
+
+    mock_llm.assert_not_called()
+    assert result["grammar_check"]["issues_found"] == 2
+    assert result["fact_check"]["score"] == 95
+    assert result["style_check"]["score"] == 100
+
+
+@pytest.mark.asyncio
+async def test_task_outcomes_persist_in_background(temp_workspace):
+    """Test queued task outcomes reach disk once flushed."""
+    agent = AnalystAgent(
+        agent_id="test:analyst",
+        role="Test Analyst",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+    )
+    for n in range(3):
+        await agent.record_task_outcome(f"task_{n}", "completed", {"status": "completed"})
+    await agent.record_task_outcome("task_3", "failed")
+    await agent.flush_outcomes()
+
+    session = agent.memory.load_session()
+    assert session["tasks_completed"] == 3
+    assert session["last_task_id"] == "task_3"
+    assert sorted(p.name for p in agent.memory.results_dir.iterdir()) == [
+        "result_task_0.json",
+        "result_task_1.json",
+        "result_task_2.json",
+    ]
+
+
+def test_seo_keyword_density(temp_workspace):
+    """Test density counts words containing the keyword."""
+    agent = SEOAgent(
+        agent_id="test:seo",
+        role="Test SEO",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+    )
+    tokens = Counter("ai tools and AI-driven care with ai".lower().split())
+    assert agent._calculate_keyword_density(tokens, 7, "AI") == 42.86
+    assert agent._calculate_keyword_density(tokens, 7, "ai tools") == 0
+
+
+@pytest.mark.asyncio
+async def test_seo_uses_single_analysis_call(temp_workspace):
+    """Test keywords and metadata come from one LLM request."""
+    agent = SEOAgent(
+        agent_id="test:seo",
+        role="Test SEO",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+    )
+    analysis = {
+        "secondary_keywords": ["Diagnostics", "Imaging"],
+        "meta_title": "AI in Healthcare",
+        "meta_description": "How AI is changing care.",
+        "og_title": "AI in Healthcare",
+        "og_description": "AI and care.",
+    }
+    mock_tool = AsyncMock(return_value=analysis)
+    with patch.object(agent, "call_llm_tool", mock_tool):
+        with patch.object(agent, "call_llm") as mock_llm:
+            result = await agent.execute_task(
+                {"id": "task_seo", "topic": "AI", "content": "# AI\nAI helps."}
+            )
+
+    mock_llm.assert_not_called()
+    assert mock_tool.call_args.kwargs["cache_ttl"] == 24 * 3600
+    assert result["keywords"]["secondary"] == ["diagnostics", "imaging"]
+    assert result["metadata"]["title"] == "AI in Healthcare"
+
+
+@pytest.mark.asyncio
+async def test_seo_without_llm_uses_templates(temp_workspace):
+    """Test use_llm=False fills keywords and metadata without LLM calls."""
+    agent = SEOAgent(
+        agent_id="test:seo",
+        role="Test SEO",
+        memory_dir=temp_workspace,
+        api_key="test_key",
+        model="test_model",
+        system_prompt="Test prompt",
+    )
+    with patch.object(agent, "call_llm_tool") as mock_tool:
+        with patch.object(agent, "call_llm") as mock_llm:
+            result = await agent.execute_task(
+                {
+                    "id": "task_seo",
+                    "topic": "AI",
+                    "content": "# AI\nAI helps.",
+                    "use_llm": False,
+                }
+            )
+
+    mock_tool.assert_not_called()
+    mock_llm.assert_not_called()
+    assert result["skipped_llm"] is True
+    assert result["keywords"]["density"] == 50.0
+    assert result["metadata"]["title"] == "AI - Complete Guide"
+
+
+def test_task_queue_snapshot_invalidated_on_write(task_queue):
+    """Test the task snapshot is reused until the queue is written."""
+    task_id = task_queue.add_task("Task", "agent1", {})
+    first = task_queue.snapshot()
+    assert task_queue.snapshot() is first
+
+    task_queue.update_task_status(task_id, TaskStatus.COMPLETED, {"ok": True})
+    tasks, by_id = task_queue.snapshot()
+    assert tasks is not first[0]
+    assert by_id[task_id].status == TaskStatus.COMPLETED
+
+
+def test_task_queue_cache_tracks_other_writers(task_queue, temp_workspace):
+    """Test cached tasks are copied out and refreshed after outside writes."""
+    task_id = task_queue.add_task("Task", "agent1", {})
+    task_queue.get_task(task_id).payload["edited"] = True
+    assert task_queue.get_task(task_id).payload == {}
+
+    TaskQueue(temp_workspace).add_task("Other", "agent1", {})
+    assert len(task_queue.get_pending_tasks("agent1")) == 2
+
+
+def test_task_queue_appends_updates_to_log(task_queue, temp_workspace):
+    """Test updates go to the task log and are folded into tasks.json."""
+    task_id = task_queue.add_task("Task", "agent1", {})
+    task_queue.update_task_status(task_id, TaskStatus.IN_PROGRESS)
+    assert not task_queue.tasks_file.exists()
+    assert len(task_queue.log_file.read_text().splitlines()) == 2
+    assert TaskQueue(temp_workspace).get_task(task_id).status == TaskStatus.IN_PROGRESS
+
+    with patch("src.orchestration.task_manager._LOG_COMPACT_MIN_BYTES", 0):
+        task_queue.update_task_status(task_id, TaskStatus.COMPLETED, {"ok": True})
+    assert task_queue.tasks_file.exists()
+    assert not task_queue.log_file.exists()
+    assert TaskQueue(temp_workspace).get_task(task_id).result == {"ok": True}
+
+
+def test_task_queue_recovers_from_torn_log_entry(task_queue, temp_workspace):
+    """Test an entry cut short by a crash does not swallow the next one."""
+    first = task_queue.add_task("First", "agent1", {})
+    with open(task_queue.log_file, "ab") as f:
+        f.write(b'{"op":"upsert","task":{"id":')
+
+    second = TaskQueue(temp_workspace).add_task("Second", "agent1", {})
+    reloaded = TaskQueue(temp_workspace)
+    assert reloaded.get_task(first) is not None
+    assert reloaded.get_task(second) is not None
+
+
+def test_task_queue_batch_writes_once(task_queue):
+    """Test tasks added in a batch are visible at once and written together."""
+    with task_queue.batch():
+        first = task_queue.add_task("First", "agent1", {})
+        second = task_queue.add_task("Second", "agent1", {}, dependencies=[first])
+        assert [t.id for t in task_queue.get_pending_tasks("agent1")] == [first]
+        assert not task_queue.log_file.exists()
+
+    assert len(task_queue.log_file.read_text().splitlines()) == 2
+    assert task_queue.get_task(second).dependencies == [first]
 
 
 def test_task_priority_ordering(task_queue):
@@ -185,6 +553,17 @@ def test_task_priority_ordering(task_queue):
     assert pending[2].priority == TaskPriority.LOW
 
 
+def test_task_ordering_prefers_tasks_with_dependents(task_queue):
+    """Test equal-priority tasks that unblock more work are dispatched first."""
+    leaf = task_queue.add_task("Leaf", "agent1", {})
+    root = task_queue.add_task("Root", "agent1", {})
+    middle = task_queue.add_task("Middle", "agent2", {}, dependencies=[root])
+    task_queue.add_task("End", "agent2", {}, dependencies=[middle])
+
+    pending = task_queue.get_pending_tasks("agent1")
+    assert [t.id for t in pending] == [root, leaf]
+
+
 def test_task_status_updates(task_queue):
     """Test task status updates."""
     task_id = task_queue.add_task(
@@ -6,7 +6,12 @@ from pathlib import Path
 from unittest.mock import patch, AsyncMock
 
 from src.workflow.workflow_engine import WorkflowEngine
-from src.orchestration.task_manager import Coordinator, TaskQueue, TaskPriority
+from src.orchestration.task_manager import (
+    Coordinator,
+    TaskQueue,
+    TaskPriority,
+    TaskStatus,
+)
 
 
 @pytest.fixture
@@ -111,6 +116,157 @@ async def test_pipeline_task_dependencies(mock_api_key, temp_workspace):
                 assert analysis_id in writing_task.dependencies
 
 
+@pytest.mark.asyncio
+async def test_pipeline_status_uses_pipeline_index(mock_api_key, temp_workspace):
+    """Test that pipeline status and results only cover the pipeline's tasks."""
+    with patch("src.config.settings.EnvironmentConfig.WORKSPACE_DIR", temp_workspace):
+        with patch("src.config.settings.EnvironmentConfig.TASK_QUEUE_DIR", temp_workspace):
+            with patch("src.agents.base_agent.BaseAgent.call_llm"):
+                engine = WorkflowEngine(mock_api_key)
+                engine.task_queue.add_task(
+                    title="Unrelated Task",
+                    assigned_agent="agent:writer:main",
+                    payload={},
+                )
+
+                pipeline = await engine.coordinator.execute_content_pipeline("Test Topic")
+                research_id = pipeline["tasks"]["research"]
+                engine.task_queue.update_task_status(
+                    research_id, TaskStatus.COMPLETED, {"status": "completed"}
+                )
+
+                status = engine.get_pipeline_status(pipeline["pipeline_id"])
+                assert set(status["tasks"]) == set(pipeline["tasks"].values())
+                assert status["overall_status"] == "pending"
+
+                results = await engine.get_pipeline_results(pipeline["pipeline_id"])
+                assert results == {research_id: {"status": "completed"}}
+
+                unknown = engine.get_pipeline_status("missing")
+                assert unknown["overall_status"] == "unknown"
+
+
+@pytest.mark.asyncio
+async def test_pending_tasks_defer_unmet_dependencies(mock_api_key, temp_workspace):
+    """Test tasks whose dependencies did not complete are never started."""
+    with patch("src.config.settings.EnvironmentConfig.WORKSPACE_DIR", temp_workspace):
+        with patch("src.config.settings.EnvironmentConfig.TASK_QUEUE_DIR", temp_workspace):
+            with patch(
+                "src.agents.research_agent.ResearchAgent.run_task",
+                AsyncMock(side_effect=RuntimeError("research failed")),
+            ):
+                engine = WorkflowEngine(mock_api_key)
+                pipeline = await engine.coordinator.execute_content_pipeline("Test Topic")
+
+                results = await engine.process_pending_tasks()
+
+                assert set(results["results"]) == {pipeline["tasks"]["research"]}
+                assert results["tasks_processed"] == 0
+                analysis_task = engine.task_queue.get_task(pipeline["tasks"]["analysis"])
+                assert analysis_task.status == TaskStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_run_pipeline_starts_independent_tasks_together(
+    mock_api_key, temp_workspace
+):
+    """Test tasks start once their own dependencies are done, in parallel."""
+    with patch("src.config.settings.EnvironmentConfig.WORKSPACE_DIR", temp_workspace):
+        with patch("src.config.settings.EnvironmentConfig.TASK_QUEUE_DIR", temp_workspace):
+            engine = WorkflowEngine(mock_api_key)
+            queue = engine.task_queue
+            root = queue.add_task("Root", "agent:researcher:main", {})
+            left = queue.add_task(
+                "Left", "agent:analyst:main", {}, dependencies=[root]
+            )
+            right = queue.add_task(
+                "Right", "agent:writer:main", {}, dependencies=[root]
+            )
+            join = queue.add_task(
+                "Join", "agent:seo:main", {}, dependencies=[left, right]
+            )
+            queue.save_pipeline_index(
+                "diamond", {"root": root, "left": left, "right": right, "join": join}
+            )
+
+            started = []
+            running = set()
+            overlaps = []
+
+            async def run_task(self, task):
+                started.append(task["id"])
+                running.add(task["id"])
+                overlaps.append(set(running))
+                await asyncio.sleep(0.01)
+                running.discard(task["id"])
+                return {"status": "completed"}
+
+            with patch("src.agents.base_agent.BaseAgent.run_task", run_task):
+                run = await engine.run_pipeline("diamond")
+
+            assert run["tasks_processed"] == 4
+            assert started[0] == root and started[-1] == join
+            assert {left, right} in overlaps
+            assert queue.get_task(join).status == TaskStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_cancelled_pipeline_leaves_tasks_pending(mock_api_key, temp_workspace):
+    """Test tasks interrupted by cancelling a run can be run again."""
+    with patch("src.config.settings.EnvironmentConfig.WORKSPACE_DIR", temp_workspace):
+        with patch("src.config.settings.EnvironmentConfig.TASK_QUEUE_DIR", temp_workspace):
+            engine = WorkflowEngine(mock_api_key)
+            task_id = engine.task_queue.add_task("Slow", "agent:researcher:main", {})
+            engine.task_queue.save_pipeline_index("slow", {"research": task_id})
+            started = asyncio.Event()
+
+            async def run_task(self, task):
+                started.set()
+                await asyncio.sleep(10)
+
+            with patch("src.agents.base_agent.BaseAgent.run_task", run_task):
+                run = asyncio.ensure_future(engine.run_pipeline("slow"))
+                await started.wait()
+                run.cancel()
+                with pytest.raises(asyncio.CancelledError):
+                    await run
+
+            assert engine.task_queue.get_task(task_id).status == TaskStatus.PENDING
+
+
+@pytest.mark.asyncio
+async def test_action_cache_replays_repeat_pipeline(
+    mock_api_key, temp_workspace, mock_stream
+):
+    """Test rerunning a pipeline for the same topic reuses every phase."""
+    with patch("src.config.settings.EnvironmentConfig.WORKSPACE_DIR", temp_workspace):
+        with patch("src.config.settings.EnvironmentConfig.TASK_QUEUE_DIR", temp_workspace):
+            with patch("src.config.settings.EnvironmentConfig.MEMORY_DIR", temp_workspace):
+                with patch(
+                    "src.config.settings.EnvironmentConfig.ACTION_CACHE_ENABLED", True
+                ):
+                    with patch("src.agents.base_agent.BaseAgent.call_llm") as mock_llm:
+                        with patch(
+                            "src.agents.base_agent.BaseAgent.call_llm_tool"
+                        ) as mock_tool:
+                            with patch(
+                                "src.agents.base_agent.BaseAgent.call_llm_stream",
+                                mock_stream("Test response"),
+                            ):
+                                mock_llm.return_value = "Test response"
+                                mock_tool.side_effect = RuntimeError("no tool support")
+
+                                engine = WorkflowEngine(mock_api_key)
+                                first = await engine.run_content_pipeline("Test Topic")
+                                calls = mock_llm.call_count
+                                second = await engine.run_content_pipeline("Test Topic")
+
+                                assert calls > 0
+                                assert mock_llm.call_count == calls
+                                assert (
+                                    len(second["results"]) == len(first["results"]) == 5
+                                )
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
 